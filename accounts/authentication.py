@@ -1,4 +1,8 @@
-from firebase_admin import credentials, initialize_app, auth
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
 from rest_framework import authentication
 from .exceptions import (
     InvalidIDToken,
@@ -7,34 +11,35 @@ from .exceptions import (
     RevokedIDToken,
     UserNotFound,
 )
+from .firebase import get_auth
 from .models import User
-import environ
-
-env = environ.Env()
 
-creds = {
-    "type": "service_account",
-    "project_id": env.str("FIREBASE_PROJECT_ID"),
-    "project_key_id": env.str("FIREBASE_PRIVATE_KEY_ID"),
-    "private_key": env.str("FIREBASE_PRIVATE_KEY").replace("\\n", "\n"),
-    "client_email": env.str("FIREBASE_CLIENT_EMAIL"),
-    "client_id": env.str("FIREBASE_CLIENT_ID"),
-    "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-    "token_uri": "https://oauth2.googleapis.com/token",
-    "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs",
-    "client_x509_cert_url": env.str("FIREBASE_CLIENT_CERT_URL"),
-}
 
-app = initialize_app(credentials.Certificate(creds))
+def get_token_cache_key(id_token):
+    return "firebase_id_token:" + hashlib.sha256(id_token.encode()).hexdigest()
 
 
 class FirebaseAuthentication(authentication.BaseAuthentication):
+    """
+    Authenticates requests with a Firebase ID token. The user resolved from a
+    token is cached (keyed by a hash of the token) until the token's `exp`
+    claim, capped at FIREBASE_TOKEN_CACHE_TIMEOUT seconds, so repeat requests
+    with the same token skip both verification and the user lookup.
+    """
+
     def authenticate(self, request):
         auth_header = request.META.get("HTTP_AUTHORIZATION")
         if not auth_header:
             raise MissingIDToken
 
         id_token = auth_header.split(" ").pop()
+        cache = caches[settings.FIREBASE_TOKEN_CACHE]
+        cache_key = get_token_cache_key(id_token)
+        user = cache.get(cache_key)
+        if user is not None:
+            return user, None
+
+        auth = get_auth()
         try:
             decoded_token = auth.verify_id_token(id_token)
         except auth.ExpiredIdTokenError:
@@ -56,4 +61,11 @@ class FirebaseAuthentication(authentication.BaseAuthentication):
             user = User.objects.get(firebase_uid=uid)
         except User.DoesNotExist:
             raise UserNotFound
+
+        timeout = min(
+            decoded_token.get("exp", 0) - time.time(),
+            settings.FIREBASE_TOKEN_CACHE_TIMEOUT,
+        )
+        if timeout > 0:
+            cache.set(cache_key, user, timeout)
         return user, None
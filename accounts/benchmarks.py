@@ -0,0 +1,66 @@
+import time
+
+import rsa
+from django.conf import settings
+from django.core.cache import caches
+from firebase_admin import auth
+from google.auth import crypt, jwt
+from rest_framework.test import APIRequestFactory
+from unittest.mock import patch
+
+from accounts.authentication import FirebaseAuthentication, get_token_cache_key
+from projectread.benchmarks import time_calls
+
+
+class LocalKeySet:
+    """
+    Stand-in for Google's public key set: signs ID tokens with a locally
+    generated RSA key and verifies them the same way firebase_admin does.
+    """
+
+    def __init__(self):
+        public_key, private_key = rsa.newkeys(2048)
+        self.signer = crypt.RSASigner.from_string(
+            private_key.save_pkcs1(), key_id="local"
+        )
+        self.certs = {"local": public_key.save_pkcs1()}
+        self.verify_count = 0
+
+    def create_token(self, uid, expires_in=3600):
+        now = int(time.time())
+        return jwt.encode(
+            self.signer, {"uid": uid, "iat": now, "exp": now + expires_in}
+        ).decode()
+
+    def verify_id_token(self, id_token):
+        self.verify_count += 1
+        try:
+            return jwt.decode(id_token, certs=self.certs)
+        except ValueError as e:
+            raise auth.InvalidIdTokenError(str(e))
+
+
+def time_authentication(user, repeat):
+    """
+    Times FirebaseAuthentication on a token for `user` signed with a
+    LocalKeySet, verifying it on every request (cold) and from the token cache.
+    """
+    key_set = LocalKeySet()
+    id_token = key_set.create_token(user.firebase_uid)
+    request = APIRequestFactory().get("/", HTTP_AUTHORIZATION="Bearer " + id_token)
+    cache = caches[settings.FIREBASE_TOKEN_CACHE]
+
+    def authenticate(cold=False):
+        if cold:
+            cache.delete(get_token_cache_key(id_token))
+        return FirebaseAuthentication().authenticate(request)
+
+    # no Firebase app is needed to verify against the local key set
+    with patch("accounts.firebase.get_app"), patch(
+        "firebase_admin.auth.verify_id_token", side_effect=key_set.verify_id_token
+    ):
+        cold = time_calls(lambda: authenticate(cold=True), repeat)
+        authenticate()
+        cached = time_calls(authenticate, repeat)
+    cache.delete(get_token_cache_key(id_token))
+    return {"cold": cold, "cached": cached}
@@ -0,0 +1,50 @@
+import threading
+
+import environ
+
+env = environ.Env()
+
+_app = None
+_app_lock = threading.Lock()
+
+
+def get_credentials():
+    return {
+        "type": "service_account",
+        "project_id": env.str("FIREBASE_PROJECT_ID"),
+        "project_key_id": env.str("FIREBASE_PRIVATE_KEY_ID"),
+        "private_key": env.str("FIREBASE_PRIVATE_KEY").replace("\\n", "\n"),
+        "client_email": env.str("FIREBASE_CLIENT_EMAIL"),
+        "client_id": env.str("FIREBASE_CLIENT_ID"),
+        "auth_uri": "https://accounts.google.com/o/oauth2/auth",
+        "token_uri": "https://oauth2.googleapis.com/token",
+        "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs",
+        "client_x509_cert_url": env.str("FIREBASE_CLIENT_CERT_URL"),
+    }
+
+
+def get_app():
+    """
+    Returns the default Firebase app, initializing it from the FIREBASE_*
+    environment variables on first use. firebase_admin is only imported here,
+    so processes that never touch Firebase (manage.py commands, workers before
+    their first authenticated request) skip both the import and the setup.
+    """
+    global _app
+    if _app is None:
+        with _app_lock:
+            if _app is None:
+                from firebase_admin import credentials, initialize_app
+
+                _app = initialize_app(credentials.Certificate(get_credentials()))
+    return _app
+
+
+def get_auth():
+    """
+    Returns the firebase_admin.auth module with the default app initialized.
+    """
+    get_app()
+    from firebase_admin import auth
+
+    return auth
@@ -0,0 +1,94 @@
+import json
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Each script boots Django like `manage.py check` or a WSGI worker would and
+# prints the time it took and whether firebase_admin was imported, optionally
+# initializing Firebase first as importing accounts.authentication used to.
+# With `initialize`, it then initializes Firebase through get_app() and prints
+# whether firebase_admin was imported afterwards.
+BOOT_SCRIPT = """
+import sys
+import time
+
+start = time.perf_counter()
+if {eager}:
+    from accounts.firebase import get_app
+
+    get_app()
+{boot}
+result = [time.perf_counter() - start, "firebase_admin" in sys.modules]
+if {initialize}:
+    from accounts.firebase import get_app
+
+    result.append(get_app() is not None and "firebase_admin" in sys.modules)
+print(*result)
+"""
+
+BOOTS = {
+    "check": """
+from django.core.management import call_command
+import django
+
+django.setup()
+call_command("check")
+""",
+    "worker": """
+from projectread.wsgi import application
+""",
+}
+
+
+def boot(name, eager=False, initialize=False):
+    """
+    Boots a fresh interpreter with the named boot script and returns the
+    time it took, whether firebase_admin was imported by the boot and, with
+    `initialize`, whether get_app() initialized Firebase afterwards.
+    """
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            BOOT_SCRIPT.format(eager=eager, initialize=initialize, boot=BOOTS[name]),
+        ],
+        cwd=settings.BASE_DIR.parent,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise CommandError(result.stderr)
+    elapsed, *loaded = result.stdout.splitlines()[-1].split()
+    return (float(elapsed), *(value == "True" for value in loaded))
+
+
+class Command(BaseCommand):
+    help = (
+        "Boots fresh interpreters like `manage.py check` and a WSGI worker "
+        "would and reports the fastest startup time with lazy Firebase "
+        "initialization and with Firebase initialized eagerly on import, as "
+        "JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=5,
+            help="Number of boots per script and mode",
+        )
+
+    def handle(self, *args, **options):
+        report = {
+            name: {
+                mode: round(
+                    min(boot(name, eager=eager)[0] for _ in range(options["runs"])),
+                    3,
+                )
+                for mode, eager in [("lazy", False), ("eager", True)]
+            }
+            for name in BOOTS
+        }
+        self.stdout.write(json.dumps(report, indent=2))
@@ -1,9 +1,11 @@
 from rest_framework import serializers
+
+from projectread.serializers import SparseFieldsetsMixin
+from .firebase import get_auth
 from .models import User
-from firebase_admin import auth
 
 
-class UserSerializer(serializers.HyperlinkedModelSerializer):
+class UserSerializer(SparseFieldsetsMixin, serializers.HyperlinkedModelSerializer):
     class Meta:
         model = User
         fields = [
@@ -27,6 +29,7 @@ class UserCreateSerializer(serializers.HyperlinkedModelSerializer):
         ]
 
     def create(self, validated_data):
+        auth = get_auth()
         try:
             firebase_user = auth.create_user(email=validated_data["email"])
         except auth.EmailAlreadyExistsError:
@@ -1,8 +1,15 @@
+import time
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APITestCase, APIRequestFactory
 from rest_framework import status
 from accounts.models import User
 from firebase_admin import auth
-from accounts.authentication import FirebaseAuthentication
+from accounts.authentication import FirebaseAuthentication, get_token_cache_key
+from accounts.benchmarks import LocalKeySet
 from accounts.exceptions import (
     InvalidIDToken,
     ExpiredIDToken,
@@ -20,6 +27,10 @@ class AuthenticationTestCase(APITestCase):
         self.factory = APIRequestFactory()
         self.request = self.factory.get("/", HTTP_AUTHORIZATION="auth_header")
         self.firebase = FirebaseAuthentication()
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
 
     def test_missing_token(self):
         request = self.factory.get("/")
@@ -62,3 +73,116 @@ class AuthenticationTestCase(APITestCase):
         self.assertRaises(UserNotFound, self.firebase.authenticate, self.request)
         response = self.client.get("/")
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "dummy": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+    }
+)
+class AuthenticationCacheTestCase(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # generating an RSA key is slow, so the test case shares one
+        cls.key_set = LocalKeySet()
+
+    def setUp(self):
+        self.user = User.objects.create(email="user@pr.com", firebase_uid="my_uid")
+        self.key_set.verify_count = 0
+        self.factory = APIRequestFactory()
+        self.firebase = FirebaseAuthentication()
+        cache.clear()
+
+        patcher = patch(
+            "firebase_admin.auth.verify_id_token",
+            side_effect=self.key_set.verify_id_token,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        cache.clear()
+
+    def authenticate(self, id_token):
+        request = self.factory.get("/", HTTP_AUTHORIZATION="Bearer " + id_token)
+        return self.firebase.authenticate(request)
+
+    def authenticate_many(self, id_token, num_requests):
+        for _ in range(num_requests):
+            self.authenticate(id_token)
+
+    def test_cached_token(self):
+        id_token = self.key_set.create_token("my_uid")
+        user, _ = self.authenticate(id_token)
+        with CaptureQueriesContext(connection) as queries:
+            cached_user, _ = self.authenticate(id_token)
+
+        self.assertEqual(cached_user, user)
+        self.assertEqual(self.key_set.verify_count, 1)
+        self.assertEqual(len(queries), 0)
+
+    def test_tokens_cached_separately(self):
+        other_user = User.objects.create(email="other@pr.com", firebase_uid="other")
+        user, _ = self.authenticate(self.key_set.create_token("my_uid"))
+        other, _ = self.authenticate(self.key_set.create_token("other"))
+
+        self.assertEqual(user, self.user)
+        self.assertEqual(other, other_user)
+        self.assertEqual(self.key_set.verify_count, 2)
+
+    def test_cache_expires_with_token(self):
+        id_token = self.key_set.create_token("my_uid", expires_in=60)
+        self.authenticate(id_token)
+        with patch("time.time", return_value=time.time() + 61):
+            self.authenticate(id_token)
+        self.assertEqual(self.key_set.verify_count, 2)
+
+    @override_settings(FIREBASE_TOKEN_CACHE_TIMEOUT=30)
+    def test_cache_timeout_cap(self):
+        id_token = self.key_set.create_token("my_uid")
+        self.authenticate(id_token)
+        with patch("time.time", return_value=time.time() + 20):
+            self.authenticate(id_token)
+        self.assertEqual(self.key_set.verify_count, 1)
+        with patch("time.time", return_value=time.time() + 31):
+            self.authenticate(id_token)
+        self.assertEqual(self.key_set.verify_count, 2)
+
+    def test_token_without_exp_not_cached(self):
+        with patch(
+            "firebase_admin.auth.verify_id_token", return_value={"uid": "my_uid"}
+        ) as mock_verify:
+            self.authenticate("auth_header")
+            self.authenticate("auth_header")
+        self.assertEqual(mock_verify.call_count, 2)
+
+    def test_failed_verification_not_cached(self):
+        self.assertRaises(
+            InvalidIDToken, self.authenticate, self.key_set.create_token("my_uid")[:-4]
+        )
+        self.assertRaises(
+            UserNotFound, self.authenticate, self.key_set.create_token("unknown")
+        )
+        self.assertIsNone(
+            cache.get(get_token_cache_key(self.key_set.create_token("unknown")))
+        )
+
+    def test_authentication_overhead(self):
+        # the work a request saves is counted in signature verifications and
+        # user queries rather than timed, so the test can't flake
+        num_requests = 50
+        id_token = self.key_set.create_token("my_uid")
+
+        with override_settings(FIREBASE_TOKEN_CACHE="dummy"):
+            with CaptureQueriesContext(connection) as queries:
+                self.authenticate_many(id_token, num_requests)
+        self.assertEqual(self.key_set.verify_count, num_requests)
+        self.assertEqual(len(queries), num_requests)
+
+        self.key_set.verify_count = 0
+        with CaptureQueriesContext(connection) as queries:
+            self.authenticate_many(id_token, num_requests)
+        self.assertEqual(self.key_set.verify_count, 1)
+        self.assertEqual(len(queries), 1)
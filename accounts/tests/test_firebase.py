@@ -0,0 +1,63 @@
+import os
+import threading
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+from unittest.mock import patch
+
+from accounts import firebase
+from accounts.management.commands.benchmark_startup import boot
+
+FIREBASE_ENV_VARS = [
+    "FIREBASE_PROJECT_ID",
+    "FIREBASE_PRIVATE_KEY_ID",
+    "FIREBASE_PRIVATE_KEY",
+    "FIREBASE_CLIENT_EMAIL",
+    "FIREBASE_CLIENT_ID",
+    "FIREBASE_CLIENT_CERT_URL",
+]
+
+
+class FirebaseAppTestCase(SimpleTestCase):
+    def setUp(self):
+        patcher = patch.object(firebase, "_app", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch("firebase_admin.credentials.Certificate")
+    @patch("firebase_admin.initialize_app")
+    def test_get_app__initializes_once(self, mock_initialize, mock_certificate):
+        def slow_initialize(*args):
+            time.sleep(0.05)
+            return object()
+
+        mock_initialize.side_effect = slow_initialize
+        apps = []
+        threads = [
+            threading.Thread(target=lambda: apps.append(firebase.get_app()))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        mock_initialize.assert_called_once()
+        self.assertEqual(len(set(map(id, apps))), 1)
+        self.assertIs(firebase.get_app(), apps[0])
+
+    def test_get_app__missing_env_vars(self):
+        with patch.dict(os.environ):
+            for var in FIREBASE_ENV_VARS:
+                os.environ.pop(var, None)
+            self.assertRaises(ImproperlyConfigured, firebase.get_app)
+        self.assertIsNone(firebase._app)
+
+
+class StartupTestCase(SimpleTestCase):
+    def test_boot(self):
+        # `manage.py benchmark_startup` reports the startup times
+        _, firebase_loaded, initialized = boot("worker", initialize=True)
+        self.assertFalse(firebase_loaded)
+        self.assertTrue(initialized)
@@ -29,6 +29,27 @@ class UserTestCase(APITestCase):
         mock_method.assert_called_with({"email": "test@user.com"})
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
+    def test_get_users(self):
+        other_user = User.objects.create(email="another@staff.com")
+        url = reverse("user-list") + "?page_size=1"
+        self.client.force_authenticate(self.user)
+        response = self.client.get(url)
+        payload = response.json()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(payload["results"], [UserSerializer(self.user).data])
+
+        payload = self.client.get(payload["next"]).json()
+        self.assertEqual(payload["results"], [UserSerializer(other_user).data])
+        self.assertIsNone(payload["next"])
+
+        # unpaginated users keep their ordering by email
+        response = self.client.get(reverse("user-list") + "?paginate=false")
+        self.assertEqual(
+            response.json(),
+            [UserSerializer(other_user).data, UserSerializer(self.user).data],
+        )
+
     def test_get_user__me(self):
         url = reverse("user-list") + "me/"
         self.client.force_authenticate(self.user)
@@ -2,10 +2,15 @@ from rest_framework import mixins, permissions, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from projectread.pagination import CursorPagination
 from .models import User
 from .serializers import UserSerializer, UserCreateSerializer
 
 
+class UserPagination(CursorPagination):
+    ordering = ("date_joined", "id")
+
+
 class UserViewSet(
     viewsets.GenericViewSet,
     mixins.ListModelMixin,
@@ -19,6 +24,7 @@ class UserViewSet(
     ]
 
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = UserPagination
 
     def get_serializer_class(self):
         if self.action == "create":
@@ -0,0 +1,237 @@
+import io
+import json
+import tracemalloc
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+import accounts.urls
+import enrolments.urls
+import registration.urls
+from accounts.benchmarks import time_authentication
+from accounts.models import User
+from enrolments.models import Class, Session
+from projectread.benchmarks import time_calls
+from registration.models import Student
+
+# number of families, sessions and classes per session seeded for each size
+DATASET_SIZES = {
+    "small": {"families": 10, "sessions": 2, "classes_per_session": 2},
+    "medium": {"families": 50, "sessions": 4, "classes_per_session": 3},
+    "large": {"families": 200, "sessions": 8, "classes_per_session": 3},
+}
+
+EXPORT_URL_NAMES = [
+    "export-families",
+    "export-students",
+    "export-fields",
+    "export-classes",
+    "export-enrolments",
+    "export-sessions",
+]
+
+
+def get_endpoint_params():
+    """
+    Returns the query params to request each endpoint with, by URL name. An
+    endpoint with several sets of params is benchmarked once per set.
+    """
+    student = Student.objects.order_by("pk").first()
+    return {
+        "family-search": [
+            {"query": f"{student.first_name} {student.last_name}"},
+            {"first_name": student.first_name, "last_name": student.last_name},
+        ],
+        "export-attendances": [
+            {"class_id": Class.objects.order_by("pk").first().pk},
+            {"session_id": Session.objects.order_by("pk").first().pk},
+        ],
+    }
+
+
+def get_endpoints():
+    """
+    Returns (name, url, params) for every GET endpoint: the list, detail and
+    extra actions of each router viewset, then the export views. Detail
+    endpoints use the first object of the viewset's queryset.
+    """
+    url_names = []
+    detail_args = {}
+    for urls in [accounts.urls, registration.urls, enrolments.urls]:
+        for _, viewset, basename in urls.router.registry:
+            if "get" not in viewset.http_method_names:
+                continue
+            if hasattr(viewset, "list"):
+                url_names.append(f"{basename}-list")
+            if hasattr(viewset, "retrieve"):
+                url_names.append(f"{basename}-detail")
+                detail_args[f"{basename}-detail"] = [
+                    viewset.queryset.order_by("pk").first().pk
+                ]
+            for action in viewset.get_extra_actions():
+                if "get" in action.mapping and not action.detail:
+                    url_names.append(f"{basename}-{action.url_name}")
+    url_names += EXPORT_URL_NAMES + ["export-attendances"]
+
+    endpoint_params = get_endpoint_params()
+    return [
+        (
+            "?".join([url_name, "&".join(params)]) if params else url_name,
+            reverse(url_name, args=detail_args.get(url_name)),
+            params,
+        )
+        for url_name in url_names
+        for params in endpoint_params.get(url_name, [{}])
+    ]
+
+
+def find_errors(report):
+    return sorted(
+        {
+            name
+            for size in report["sizes"].values()
+            for name, result in size["endpoints"].items()
+            if result["status"] != 200
+        }
+    )
+
+
+def find_query_growth(report):
+    """
+    Returns the endpoints whose query count is higher for a larger dataset
+    than for the smallest one, i.e. whose queries scale with the data.
+    """
+    sizes = list(report["sizes"].values())
+    smallest = sizes[0]["endpoints"]
+    return sorted(
+        {
+            name
+            for size in sizes[1:]
+            for name, result in size["endpoints"].items()
+            if name in smallest and result["queries"] > smallest[name]["queries"]
+        }
+    )
+
+
+@contextmanager
+def seeded_dataset(dataset):
+    """
+    Seeds `dataset` with load_initial_data and yields an API client logged in
+    as its staff user. The dataset is rolled back on exit.
+    """
+    # the API client requests from "testserver", as in the test suite
+    with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+        with transaction.atomic():
+            call_command("load_initial_data", stdout=io.StringIO(), **dataset)
+            client = APIClient()
+            client.force_authenticate(User.objects.get(email="user@test.com"))
+            yield client
+            transaction.set_rollback(True)
+
+
+def write_report(command, report, output=None):
+    # to the `output` file, or to the command's stdout
+    report = json.dumps(report, indent=2)
+    if output:
+        with open(output, "w") as f:
+            f.write(report)
+    else:
+        command.stdout.write(report)
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds datasets of increasing size with load_initial_data, requests every "
+        "GET endpoint and reports query counts, p50/p95 latency and peak memory "
+        "as JSON, along with the latency of authenticating a cold and a cached "
+        "Firebase ID token. Each dataset is rolled back afterwards. Fails if an "
+        "endpoint's query count grows with the size of the data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            choices=DATASET_SIZES.keys(),
+            default=list(DATASET_SIZES.keys()),
+            help="Dataset sizes to benchmark, smallest first",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Number of timed requests per endpoint",
+        )
+        parser.add_argument(
+            "--output",
+            help="File to write the JSON report to (defaults to stdout)",
+        )
+
+    def handle(self, *args, **options):
+        report = {"sizes": {}}
+        for size in options["sizes"]:
+            report["sizes"][size] = self.benchmark_size(
+                DATASET_SIZES[size], options["repeat"]
+            )
+        report["authentication"] = self.benchmark_authentication(options["repeat"])
+        report["errors"] = find_errors(report)
+        report["query_growth"] = find_query_growth(report)
+        write_report(self, report, options["output"])
+
+        if report["errors"]:
+            raise CommandError(
+                "Endpoints did not respond with 200: " + ", ".join(report["errors"])
+            )
+        if report["query_growth"]:
+            raise CommandError(
+                "Query count grows with data size for: "
+                + ", ".join(report["query_growth"])
+            )
+
+    def benchmark_size(self, dataset, repeat):
+        with seeded_dataset(dataset) as client:
+            endpoints = {
+                name: self.benchmark_endpoint(client, url, params, repeat)
+                for name, url, params in get_endpoints()
+            }
+        return {**dataset, "endpoints": endpoints}
+
+    def benchmark_authentication(self, repeat):
+        with transaction.atomic():
+            user = User.objects.create(
+                email="benchmark@test.com", firebase_uid="benchmark"
+            )
+            result = time_authentication(user, repeat)
+            transaction.set_rollback(True)
+        return result
+
+    def benchmark_endpoint(self, client, url, params, repeat):
+        # the first request counts queries and peak memory, and warms up
+        tracemalloc.start()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.request(client, url, params)
+        # read now, as later requests reset the connection's query log
+        num_queries = len(queries)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        return {
+            "url": url,
+            "params": params,
+            "status": response.status_code,
+            "queries": num_queries,
+            **time_calls(lambda: self.request(client, url, params), repeat),
+            "peak_memory_kb": round(peak_memory / 1024, 1),
+        }
+
+    def request(self, client, url, params):
+        response = client.get(url, params)
+        if response.streaming:
+            b"".join(response.streaming_content)
+        return response
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+from django.urls import reverse
+
+from enrolments.models import Session
+from projectread.benchmarks import benchmark_renderers
+from .benchmark import DATASET_SIZES, seeded_dataset, write_report
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds a dataset with load_initial_data, fetches the session detail "
+        "payload of the session with the most enrolments and reports how long "
+        "DRF's JSONRenderer and JSONParser and the orjson ones take to render "
+        "and parse it, as JSON. The dataset is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--size",
+            choices=DATASET_SIZES.keys(),
+            default="large",
+            help="Dataset size to seed",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=50,
+            help="Number of timed renders and parses per class",
+        )
+        parser.add_argument(
+            "--output",
+            help="File to write the JSON report to (defaults to stdout)",
+        )
+
+    def handle(self, *args, **options):
+        with seeded_dataset(DATASET_SIZES[options["size"]]) as client:
+            session = (
+                Session.objects.annotate(num_enrolments=Count("enrolments"))
+                .order_by("-num_enrolments", "pk")
+                .first()
+            )
+            data = client.get(reverse("session-detail", args=[session.pk])).data
+
+        report = {
+            "size": options["size"],
+            **benchmark_renderers(data, options["repeat"]),
+        }
+        write_report(self, report, options["output"])
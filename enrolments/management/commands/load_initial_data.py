@@ -1,9 +1,15 @@
+import csv
+import io
+import time
+
 from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.db import connection, models, transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
 from faker import Faker
 
 from accounts.models import User
-from enrolments.models import Session, Class, Enrolment
+from enrolments.models import AttendanceRecord, Session, Class, Enrolment
 from registration.models import Family, Student, Field
 import enrolments.tests.utils.utils as enrolment_utils
 import registration.tests.utils.utils as registration_utils
@@ -37,6 +43,18 @@ class Command(BaseCommand):
             default=3,
             help="Number of classes per session",
         )
+        parser.add_argument(
+            "--bulk",
+            action="store_true",
+            help="Generate families in memory and insert them in batches, "
+            "for seeding large datasets",
+        )
+        parser.add_argument(
+            "--batch_size",
+            type=int,
+            default=5000,
+            help="Number of families per batch in bulk mode",
+        )
         parser.add_argument(
             "--verbose",
             action="store_true",
@@ -49,6 +67,8 @@ class Command(BaseCommand):
         num_sessions = options.get("sessions")
         num_classes_per_session = options.get("classes_per_session")
         verbose = options.get("verbose")
+        bulk = options.get("bulk")
+        batch_size = options.get("batch_size")
 
         try:
             with transaction.atomic():
@@ -57,17 +77,16 @@ class Command(BaseCommand):
                 Session.objects.all().delete()
                 Field.objects.all().delete()
                 Family.objects.all().delete()
-                Student.objects.all().delete()
+                if bulk:
+                    # safedelete soft deletes students one save at a time, which
+                    # is too slow to reset a large seed; delete them outright
+                    models.QuerySet.delete(Student.all_objects.all())
+                else:
+                    Student.objects.all().delete()
                 User.objects.filter(email="user@test.com").delete()
 
                 registration_utils.create_test_fields()
                 staff_user = account_utils.create_staff_user()
-                for _ in range(num_families):
-                    registration_utils.create_test_family_with_students(
-                        num_children=fake.pyint(min_value=1, max_value=3),
-                        num_guests=fake.pyint(max_value=1),
-                        staff_user=staff_user,
-                    )
 
                 sessions = enrolment_utils.create_test_sessions(
                     num_sessions,
@@ -93,22 +112,40 @@ class Command(BaseCommand):
                 num_families_per_class = -(
                     -num_families // num_classes
                 )  # ceiling division (upside-down floor division)
-                for i, class_ in enumerate(classes):
-                    enrolment_utils.create_test_enrolments(
-                        session=class_.session,
-                        enrolled_class=class_,
-                        families=Family.objects.all()[
-                            (i * num_families_per_class) : (i + 1)
-                            * num_families_per_class
-                        ],
+
+                if bulk:
+                    self.bulk_create_families(
+                        num_families,
+                        classes,
+                        num_families_per_class,
+                        staff_user,
+                        batch_size,
+                        verbose,
                     )
+                else:
+                    for _ in range(num_families):
+                        registration_utils.create_test_family_with_students(
+                            num_children=fake.pyint(min_value=1, max_value=3),
+                            num_guests=fake.pyint(max_value=1),
+                            staff_user=staff_user,
+                        )
+
+                    for i, class_ in enumerate(classes):
+                        enrolment_utils.create_test_enrolments(
+                            session=class_.session,
+                            enrolled_class=class_,
+                            families=Family.objects.all()[
+                                (i * num_families_per_class) : (i + 1)
+                                * num_families_per_class
+                            ],
+                        )
 
             if verbose:
                 self.stdout.write(
                     self.style.SUCCESS(
                         f"Successfully created {Field.objects.all().count()} fields, "
                         f"{Family.objects.all().count()} families, and "
-                        f"{len(Student.objects.all())} students"
+                        f"{Student.objects.all().count()} students"
                     )
                 )
 
@@ -116,3 +153,112 @@ class Command(BaseCommand):
             if verbose:
                 self.stdout.write(self.style.ERROR(f"Something went wrong"))
             raise
+
+    def bulk_create_families(
+        self,
+        num_families,
+        classes,
+        num_families_per_class,
+        staff_user,
+        batch_size,
+        verbose,
+    ):
+        """
+        Creates families with their parent, children, guests and enrolment a
+        batch at a time with bulk_create, reading the fields students answer
+        only once. Class attendance is saved once all families exist, with
+        attendance records loaded through COPY.
+        """
+        role_fields = registration_utils.get_role_fields()
+        start_time = time.perf_counter()
+
+        for start in range(0, num_families, batch_size):
+            end = min(start + batch_size, num_families)
+            last_names = [fake.last_name() for _ in range(start, end)]
+            families = Family.objects.bulk_create(
+                [
+                    registration_utils.build_test_family(last_name, staff_user)
+                    for last_name in last_names
+                ]
+            )
+
+            parents = Student.objects.bulk_create(
+                [
+                    registration_utils.build_test_student(
+                        family, last_name, Student.PARENT, role_fields[Field.PARENT]
+                    )
+                    for family, last_name in zip(families, last_names)
+                ]
+            )
+            # one UPDATE ... FROM instead of bulk_update's CASE per family
+            Family.objects.filter(id__in=[family.id for family in families]).update(
+                parent=Subquery(
+                    Student.objects.filter(
+                        family=OuterRef("pk"), role=Student.PARENT
+                    ).values("id")[:1]
+                )
+            )
+
+            students = []
+            for family, last_name in zip(families, last_names):
+                for role, num_students in [
+                    (Student.CHILD, fake.pyint(min_value=1, max_value=3)),
+                    (Student.GUEST, fake.pyint(max_value=1)),
+                ]:
+                    students.extend(
+                        registration_utils.build_test_student(
+                            family, last_name, role, role_fields[role]
+                        )
+                        for _ in range(num_students)
+                    )
+            Student.objects.bulk_create(students)
+
+            student_ids = {parent.family_id: [parent.id] for parent in parents}
+            for student in students:
+                student_ids[student.family_id].append(student.id)
+
+            enrolments = []
+            for i, family in enumerate(families, start):
+                class_ = classes[i // num_families_per_class]
+                enrolments.append(
+                    enrolment_utils.build_test_enrolment(
+                        family, class_.session, class_, student_ids[family.id]
+                    )
+                )
+            Enrolment.objects.bulk_create(enrolments)
+
+            if verbose:
+                elapsed = time.perf_counter() - start_time
+                self.stdout.write(
+                    f"Created {end}/{num_families} families "
+                    f"({end / elapsed:.0f} families/s)"
+                )
+
+        Class.objects.bulk_update(classes, ["attendance"])
+        for class_ in classes:
+            copy_attendance_records(class_)
+
+
+def copy_attendance_records(class_):
+    """
+    Loads the attendance records for `class_`'s attendance with COPY, which is
+    much faster than bulk_create for the millions of rows a large seed has.
+    """
+    columns = [
+        AttendanceRecord._meta.get_field(name).column
+        for name in ["attended_class", "student", "date", "created_at"]
+    ]
+    created_at = timezone.now().isoformat()
+    rows = io.StringIO()
+    writer = csv.writer(rows)
+    for record in class_.attendance:
+        for student_id in set(record["attendees"]):
+            writer.writerow([class_.id, student_id, record["date"], created_at])
+    rows.seek(0)
+
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {AttendanceRecord._meta.db_table} ({', '.join(columns)}) "
+            "FROM STDIN WITH (FORMAT csv)",
+            rows,
+        )
@@ -0,0 +1,18 @@
+from django.db import models
+
+
+class EnrolmentQuerySet(models.QuerySet):
+    def with_session_details(self, expand=False):
+        # expanded enrolments also render every class in the session
+        queryset = self.select_related("session", "preferred_class", "enrolled_class")
+        if expand:
+            return queryset.prefetch_related("session__classes")
+        return queryset
+
+    def with_family_details(self, expand=False):
+        # the family, students, session and classes an enrolment is rendered with
+        return (
+            self.with_session_details(expand)
+            .select_related("family__parent")
+            .prefetch_related("family__students")
+        )
@@ -0,0 +1,93 @@
+# Generated by Django 3.1.6 on 2026-10-18 14:49
+
+from datetime import datetime
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_attendance_records(apps, schema_editor):
+    Class = apps.get_model("enrolments", "Class")
+    AttendanceRecord = apps.get_model("enrolments", "AttendanceRecord")
+    Student = apps.get_model("registration", "Student")
+
+    student_ids = set(Student.objects.values_list("id", flat=True))
+    records = []
+    for class_obj in Class.objects.only("id", "attendance").iterator():
+        if not isinstance(class_obj.attendance, list):
+            continue
+        for entry in class_obj.attendance:
+            try:
+                date = datetime.strptime(entry["date"], "%Y-%m-%d").date()
+                attendees = set(entry["attendees"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            records.extend(
+                AttendanceRecord(
+                    attended_class_id=class_obj.id, student_id=student_id, date=date
+                )
+                for student_id in attendees
+                if student_id in student_ids
+            )
+
+    AttendanceRecord.objects.bulk_create(
+        records, batch_size=5000, ignore_conflicts=True
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("registration", "0024_student_deleted"),
+        ("enrolments", "0025_auto_20210928_0027"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AttendanceRecord",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "attended_class",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="attendance_records",
+                        to="enrolments.class",
+                    ),
+                ),
+                (
+                    "student",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="attendance_records",
+                        to="registration.student",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="attendancerecord",
+            index=models.Index(
+                fields=["student", "date"], name="enrolments__student_52834e_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="attendancerecord",
+            constraint=models.UniqueConstraint(
+                fields=("attended_class", "date", "student"),
+                name="unique_attendance_record",
+            ),
+        ),
+        migrations.RunPython(
+            backfill_attendance_records, reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -1,8 +1,18 @@
-from django.db import models
+from collections import defaultdict
+from datetime import datetime
+from functools import reduce
+from operator import or_
+
+from django.apps import apps
+from django.db import models, transaction
+from django.db.models import Q
+from django.utils import timezone
+from .managers import EnrolmentQuerySet
 from .validators import (
     validate_attendance,
     validate_enrolment,
     validate_fields,
+    validate_schema,
 )
 from django.contrib.postgres.fields import ArrayField
 
@@ -78,6 +88,178 @@ class Class(models.Model):
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.sync_attendance_records()
+
+    def sync_attendance_records(self):
+        """
+        Mirrors the attendance JSON into AttendanceRecord rows, so attendance can
+        be queried per student or per date in SQL. The JSON remains the source
+        of truth for the API; only rows that differ from it are written.
+        """
+        Student = apps.get_model("registration", "Student")
+        attended = parse_attendance(self.attendance)
+        existing_student_ids = set(
+            Student.all_objects.filter(
+                pk__in={student_id for _, student_id in attended}
+            ).values_list("id", flat=True)
+        )
+        attended = {
+            (date, student_id)
+            for date, student_id in attended
+            if student_id in existing_student_ids
+        }
+        records = {
+            (date, student_id): record_id
+            for record_id, date, student_id in self.attendance_records.values_list(
+                "id", "date", "student_id"
+            )
+        }
+
+        AttendanceRecord.objects.filter(
+            id__in=[
+                record_id for key, record_id in records.items() if key not in attended
+            ]
+        ).delete()
+        # rows inserted by a concurrent save or update_attendance since
+        # `records` was read are skipped rather than raising IntegrityError
+        AttendanceRecord.objects.bulk_create(
+            [
+                AttendanceRecord(attended_class=self, date=date, student_id=student_id)
+                for date, student_id in attended
+                if (date, student_id) not in records
+            ],
+            ignore_conflicts=True,
+        )
+
+    def update_attendance(self, changes):
+        """
+        Applies attendance changes, each a date with the IDs of the students
+        marked present and absent on it, to the attendance JSON. The row is
+        locked while the changes are merged, so concurrent changes are applied
+        one after the other instead of overwriting each other, and only the
+        AttendanceRecord rows of the students changed are written.
+        """
+        with transaction.atomic():
+            attendance = (
+                Class.objects.select_for_update()
+                .values_list("attendance", flat=True)
+                .get(pk=self.pk)
+            )
+            # key by the parsed date, since stored dates need not be zero-padded
+            by_date = {}
+            for record in attendance:
+                try:
+                    date = datetime.strptime(record["date"], "%Y-%m-%d").date()
+                except ValueError:
+                    continue
+                by_date[date] = record
+            changed = set()
+            for change in changes:
+                date = change["date"]
+                if date not in by_date:
+                    by_date[date] = {"date": date.isoformat(), "attendees": []}
+                    attendance.append(by_date[date])
+                absent = set(change["absent"])
+                attendees = [
+                    student_id
+                    for student_id in by_date[date]["attendees"]
+                    if student_id not in absent
+                ]
+                attendees += [
+                    student_id
+                    for student_id in dict.fromkeys(change["present"])
+                    if student_id not in attendees
+                ]
+                by_date[date]["attendees"] = attendees
+                changed.update(
+                    (change["date"], student_id)
+                    for student_id in change["present"] + change["absent"]
+                )
+
+            self.attendance = attendance
+            self.updated_at = timezone.now()
+            Class.objects.filter(pk=self.pk).update(
+                attendance=attendance, updated_at=self.updated_at
+            )
+
+            attendee_ids = {
+                date: set(record["attendees"]) for date, record in by_date.items()
+            }
+            attended = {
+                (date, student_id)
+                for date, student_id in changed
+                if student_id in attendee_ids[date]
+            }
+            absent = defaultdict(list)
+            for date, student_id in changed - attended:
+                absent[date].append(student_id)
+            if absent:
+                self.attendance_records.filter(
+                    reduce(
+                        or_,
+                        [
+                            Q(date=date, student_id__in=student_ids)
+                            for date, student_ids in absent.items()
+                        ],
+                    )
+                ).delete()
+            AttendanceRecord.objects.bulk_create(
+                [
+                    AttendanceRecord(
+                        attended_class=self, date=date, student_id=student_id
+                    )
+                    for date, student_id in changed & attended
+                ],
+                ignore_conflicts=True,
+            )
+
+
+class AttendanceRecord(models.Model):
+    attended_class = models.ForeignKey(
+        "enrolments.Class",
+        on_delete=models.CASCADE,
+        related_name="attendance_records",
+    )
+    student = models.ForeignKey(
+        "registration.Student",
+        on_delete=models.CASCADE,
+        related_name="attendance_records",
+    )
+    date = models.DateField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["attended_class", "date", "student"],
+                name="unique_attendance_record",
+            )
+        ]
+        indexes = [models.Index(fields=["student", "date"])]
+
+    def __str__(self):
+        return f"{self.student_id} - {self.attended_class_id} - {self.date}"
+
+
+def parse_attendance(attendance):
+    """
+    Returns the set of (date, student ID) pairs in a Class's attendance JSON,
+    skipping entries that do not match the expected schema or date format.
+    """
+    if not validate_schema(attendance, [{"date": "str", "attendees": ["int"]}]):
+        return set()
+    attended = set()
+    for record in attendance:
+        try:
+            date = datetime.strptime(record["date"], "%Y-%m-%d").date()
+        except ValueError:
+            continue
+        attended.update((date, student_id) for student_id in record["attendees"])
+    return attended
+
 
 class Enrolment(models.Model):
     SIGNED_UP = "Signed up"
@@ -135,6 +317,14 @@ class Enrolment(models.Model):
     )
     is_guest = models.BooleanField(default=False)
 
+    objects = EnrolmentQuerySet.as_manager()
+
     def clean(self):
         validate_enrolment(self)
         return super().clean()
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # the family's memoized current enrolment may have changed
+        if Enrolment.family.is_cached(self):
+            self.family.clear_cached_relations()
@@ -1,7 +1,14 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
 from rest_framework.fields import SerializerMethodField
+from rest_framework.settings import api_settings
 
-from registration.models import Family
+from projectread.serializers import SparseFieldsetsMixin, get_expanded
+from registration.models import Family, Student
 from accounts.models import User
 from .models import Session, Class, Enrolment
 from .validators import (
@@ -10,7 +17,7 @@ from .validators import (
 )
 
 
-class ClassListSerializer(serializers.HyperlinkedModelSerializer):
+class ClassListSerializer(SparseFieldsetsMixin, serializers.HyperlinkedModelSerializer):
     class Meta:
         model = Class
         fields = [
@@ -21,7 +28,9 @@ class ClassListSerializer(serializers.HyperlinkedModelSerializer):
         ]
 
 
-class ClassDetailSerializer(serializers.HyperlinkedModelSerializer):
+class ClassDetailSerializer(
+    SparseFieldsetsMixin, serializers.HyperlinkedModelSerializer
+):
     families = serializers.SerializerMethodField()
 
     class Meta:
@@ -35,21 +44,7 @@ class ClassDetailSerializer(serializers.HyperlinkedModelSerializer):
         ]
 
     def get_families(self, obj):
-        from registration.serializers import FamilySerializer
-
-        request = self.context.get("request")
-        return [
-            FamilySerializer(
-                enrolment.family,
-                context={
-                    "request": request,
-                    "enrolment": EnrolmentSerializer(
-                        enrolment, context={"request": request}
-                    ).data,
-                },
-            ).data
-            for enrolment in obj.enrolments.order_by("created_at")
-        ]
+        return serialize_roster(self, obj.enrolments.all())
 
 
 class ClassCreateSerializer(serializers.HyperlinkedModelSerializer):
@@ -77,7 +72,49 @@ class ClassCreateSerializer(serializers.HyperlinkedModelSerializer):
         return class_obj
 
 
-class SessionListSerializer(serializers.HyperlinkedModelSerializer):
+class AttendanceChangeListSerializer(serializers.ListSerializer):
+    def validate(self, attrs):
+        # only the students marked present need to exist
+        present = {student_id for change in attrs for student_id in change["present"]}
+        missing = present - set(
+            Student.objects.filter(pk__in=present).values_list("id", flat=True)
+        )
+        if missing:
+            raise serializers.ValidationError(
+                "one or more of the following attendee IDs do not exist: "
+                + str(sorted(missing))
+            )
+        return attrs
+
+
+class AttendanceChangeSerializer(serializers.Serializer):
+    """
+    The students marked present and absent on one date, as accepted by
+    POST /classes/{id}/attendance/.
+    """
+
+    date = serializers.DateField()
+    present = serializers.ListField(
+        child=serializers.IntegerField(min_value=0), default=list
+    )
+    absent = serializers.ListField(
+        child=serializers.IntegerField(min_value=0), default=list
+    )
+
+    class Meta:
+        list_serializer_class = AttendanceChangeListSerializer
+
+    def validate(self, attrs):
+        if set(attrs["present"]) & set(attrs["absent"]):
+            raise serializers.ValidationError(
+                "A student cannot be both present and absent on the same date"
+            )
+        return attrs
+
+
+class SessionListSerializer(
+    SparseFieldsetsMixin, serializers.HyperlinkedModelSerializer
+):
     classes = ClassListSerializer(many=True)
 
     class Meta:
@@ -90,7 +127,21 @@ class SessionListSerializer(serializers.HyperlinkedModelSerializer):
         ]
 
 
-class SessionDetailSerializer(serializers.HyperlinkedModelSerializer):
+class SessionSummarySerializer(
+    SparseFieldsetsMixin, serializers.HyperlinkedModelSerializer
+):
+    class Meta:
+        model = Session
+        fields = [
+            "id",
+            "name",
+            "active",
+        ]
+
+
+class SessionDetailSerializer(
+    SparseFieldsetsMixin, serializers.HyperlinkedModelSerializer
+):
     classes = ClassListSerializer(many=True)
     families = SerializerMethodField()
 
@@ -105,20 +156,7 @@ class SessionDetailSerializer(serializers.HyperlinkedModelSerializer):
         ]
 
     def get_families(self, obj):
-        from registration.serializers import FamilySerializer
-
-        return [
-            FamilySerializer(
-                enrolment.family,
-                context={
-                    "request": self.context.get("request"),
-                    "enrolment": EnrolmentSerializer(enrolment).data,
-                },
-            ).data
-            for enrolment in obj.enrolments.filter(is_guest=False).order_by(
-                "created_at"
-            )
-        ]
+        return serialize_roster(self, obj.enrolments.filter(is_guest=False))
 
 
 class SessionCreateSerializer(serializers.ModelSerializer):
@@ -143,7 +181,7 @@ class SessionCreateSerializer(serializers.ModelSerializer):
         return session
 
 
-class EnrolmentSerializer(serializers.HyperlinkedModelSerializer):
+class EnrolmentSerializer(SparseFieldsetsMixin, serializers.HyperlinkedModelSerializer):
     family = serializers.PrimaryKeyRelatedField(
         allow_null=True,
         queryset=Family.objects.all(),
@@ -155,6 +193,7 @@ class EnrolmentSerializer(serializers.HyperlinkedModelSerializer):
     enrolled_class = serializers.PrimaryKeyRelatedField(
         queryset=Class.objects.all(), allow_null=True
     )
+    session_serializer_class = SessionListSerializer
 
     class Meta:
         model = Enrolment
@@ -175,17 +214,33 @@ class EnrolmentSerializer(serializers.HyperlinkedModelSerializer):
 
     def to_representation(self, instance):
         response = super().to_representation(instance)
-        response["session"] = SessionListSerializer(instance.session).data
-        if response["preferred_class"] is not None:
-            response["preferred_class"] = ClassListSerializer(
-                instance.preferred_class
-            ).data
-        if response["enrolled_class"] is not None:
-            response["enrolled_class"] = ClassListSerializer(
-                instance.enrolled_class
-            ).data
+        if "session" in response:
+            if instance.session_id is None:
+                response["session"] = self.session_serializer_class(None).data
+            else:
+                response["session"] = self.summarize(
+                    self.session_serializer_class, instance, "session"
+                )
+        for field in ["preferred_class", "enrolled_class"]:
+            if response.get(field) is not None:
+                response[field] = self.summarize(ClassListSerializer, instance, field)
         return response
 
+    def summarize(self, serializer_class, instance, field):
+        # each session or class is serialized once per response
+        context = self.get_nested_context(field)
+        key = (
+            serializer_class,
+            getattr(instance, f"{field}_id"),
+            tuple(context["field_path"]),
+        )
+        summaries = context["summaries"]
+        if key not in summaries:
+            summaries[key] = serializer_class(
+                getattr(instance, field), context=context
+            ).data
+        return summaries[key]
+
     def validate(self, attrs):
         if self.instance is not None:
             # updates should validate against the existing family & session
@@ -205,3 +260,207 @@ class EnrolmentSerializer(serializers.HyperlinkedModelSerializer):
             validate_class_in_session(attrs["enrolled_class"], attrs["session"])
 
         return super().validate(attrs)
+
+
+class EnrolmentSummarySerializer(EnrolmentSerializer):
+    """
+    Read-only enrolment shape for lists of results, where the session is
+    summarized instead of being rendered with all of its classes.
+    """
+
+    session_serializer_class = SessionSummarySerializer
+
+
+def serialize_roster(serializer, enrolments):
+    """
+    Renders the `families` of a class or session: each enrolled family with
+    FamilySerializer, showing that enrolment instead of its current one.
+    """
+    from registration.serializers import FamilySerializer
+
+    enrolment_serializer_class = get_enrolment_serializer_class(serializer.context)
+    families = []
+    for enrolment in enrolments.with_family_details(
+        expand=enrolment_serializer_class is EnrolmentSerializer
+    ).order_by("created_at"):
+        family_serializer = FamilySerializer(
+            enrolment.family, context=serializer.get_nested_context("families")
+        )
+        if "enrolment" in family_serializer.fields:
+            family_serializer.context["enrolment"] = enrolment_serializer_class(
+                enrolment, context=family_serializer.get_nested_context("enrolment")
+            ).data
+        families.append(family_serializer.data)
+    return families
+
+
+def get_enrolment_serializer_class(context):
+    """
+    Enrolments nested in families, sessions and classes are rendered with
+    EnrolmentSummarySerializer, unless the request asks for the expanded
+    shape with `?expand=enrolments`.
+    """
+    if "enrolments" in get_expanded(context.get("request")):
+        return EnrolmentSerializer
+    return EnrolmentSummarySerializer
+
+
+class EnrolmentBulkListSerializer(serializers.ListSerializer):
+    """
+    Creates enrolments without an id and updates those with one, all or none.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, list) and len(data) > settings.MAX_BULK_ENROLMENTS:
+            raise serializers.ValidationError(
+                {
+                    api_settings.NON_FIELD_ERRORS_KEY: [
+                        f"At most {settings.MAX_BULK_ENROLMENTS} enrolments can be "
+                        "created or updated at once"
+                    ]
+                }
+            )
+        attrs = super().to_internal_value(data)
+        errors = self.validate_references(attrs)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return attrs
+
+    def validate_references(self, attrs):
+        # EnrolmentSerializer's checks, for every enrolment at once
+        self.instances = Enrolment.objects.in_bulk(
+            [item["id"] for item in attrs if "id" in item]
+        )
+        family_ids = set(
+            Family.objects.filter(
+                pk__in=[item["family_id"] for item in attrs]
+            ).values_list("id", flat=True)
+        )
+        family_students = defaultdict(set)
+        for family_id, student_id in Student.objects.filter(
+            family_id__in=family_ids
+        ).values_list("family_id", "id"):
+            family_students[family_id].add(student_id)
+        session_ids = set(
+            Session.objects.filter(
+                pk__in=[item["session_id"] for item in attrs]
+            ).values_list("id", flat=True)
+        )
+        classes = {
+            class_id: (name, session_id)
+            for class_id, name, session_id in Class.objects.filter(
+                pk__in=[
+                    item[field]
+                    for item in attrs
+                    for field in ["preferred_class_id", "enrolled_class_id"]
+                    if item.get(field) is not None
+                ]
+            ).values_list("id", "name", "session_id")
+        }
+
+        does_not_exist = serializers.PrimaryKeyRelatedField.default_error_messages[
+            "does_not_exist"
+        ]
+        errors = []
+        seen_ids = set()
+        for item in attrs:
+            item_errors = {}
+            family_id, session_id = item["family_id"], item["session_id"]
+            if "id" in item:
+                instance = self.instances.get(item["id"])
+                if instance is None:
+                    item_errors["id"] = [f"Enrolment with ID {item['id']} not found"]
+                elif item["id"] in seen_ids:
+                    item_errors["id"] = [
+                        f"Enrolment with ID {item['id']} is listed more than once"
+                    ]
+                elif family_id != instance.family_id:
+                    item_errors["family"] = ["family cannot be updated"]
+                elif session_id != instance.session_id:
+                    item_errors["session"] = ["session cannot be updated"]
+                seen_ids.add(item["id"])
+
+            if family_id not in family_ids:
+                item_errors["family"] = [does_not_exist.format(pk_value=family_id)]
+            elif "students" in item and len(item["students"]) != len(
+                set(item["students"]) & family_students[family_id]
+            ):
+                item_errors["students"] = [
+                    "Enrolled student IDs do not completely match with students "
+                    "under this family"
+                ]
+            if session_id not in session_ids:
+                item_errors["session"] = [does_not_exist.format(pk_value=session_id)]
+            for field in ["preferred_class", "enrolled_class"]:
+                class_id = item.get(f"{field}_id")
+                if class_id is None:
+                    continue
+                if class_id not in classes:
+                    item_errors[field] = [does_not_exist.format(pk_value=class_id)]
+                elif classes[class_id][1] != session_id:
+                    item_errors[field] = [
+                        f"Class {classes[class_id][0]} is not in session with ID "
+                        f"{session_id}"
+                    ]
+            errors.append(item_errors)
+        return errors
+
+    def create(self, validated_data):
+        now = timezone.now()
+        enrolments = []
+        created = []
+        updated = []
+        updated_fields = {"updated_at"}
+        for item in validated_data:
+            if "id" in item:
+                enrolment = self.instances[item["id"]]
+                for field, value in item.items():
+                    setattr(enrolment, field, value)
+                # bulk_update skips auto_now
+                enrolment.updated_at = now
+                updated_fields.update(item.keys() - {"id"})
+                updated.append(enrolment)
+            else:
+                enrolment = Enrolment(**item)
+                created.append(enrolment)
+            enrolments.append(enrolment)
+
+        with transaction.atomic():
+            Enrolment.objects.bulk_create(created)
+            Enrolment.objects.bulk_update(updated, sorted(updated_fields))
+        return enrolments
+
+
+class EnrolmentBulkSerializer(serializers.ModelSerializer):
+    """
+    Compact enrolment shape for POST /enrolments/bulk/, with related objects
+    as ids so that neither validation nor the response queries per enrolment.
+    """
+
+    id = serializers.IntegerField(required=False)
+    family = serializers.IntegerField(source="family_id")
+    session = serializers.IntegerField(source="session_id")
+    preferred_class = serializers.IntegerField(
+        source="preferred_class_id", allow_null=True
+    )
+    enrolled_class = serializers.IntegerField(
+        source="enrolled_class_id", allow_null=True
+    )
+
+    class Meta:
+        model = Enrolment
+        fields = [
+            "id",
+            "enrolled_class",
+            "family",
+            "is_guest",
+            "preferred_class",
+            "session",
+            "status",
+            "students",
+            "created_at",
+        ]
+        read_only_fields = [
+            "created_at",
+        ]
+        list_serializer_class = EnrolmentBulkListSerializer
@@ -8,7 +8,9 @@ from enrolments.models import Enrolment
 from enrolments.serializers import (
     ClassListSerializer,
     SessionListSerializer,
+    SessionSummarySerializer,
     EnrolmentSerializer,
+    EnrolmentSummarySerializer,
 )
 from enrolments.tests.utils.utils import create_test_classes, create_test_sessions
 
@@ -76,6 +78,25 @@ class EnrolmentSerializerTestCase(TestCase):
         self.assertIsNone(EnrolmentSerializer(self.enrolment).data["preferred_class"])
         self.assertIsNone(EnrolmentSerializer(self.enrolment).data["enrolled_class"])
 
+    def test_enrolment_summary_serializer(self):
+        other_family = create_test_family(last_name="Ng")
+        Enrolment.objects.create(
+            family=other_family,
+            session=self.session,
+            preferred_class=self.class1,
+            enrolled_class=self.class2,
+        )
+        enrolments = Enrolment.objects.filter(session=self.session).order_by("id")
+
+        # the session and classes are serialized once, from the first enrolment
+        with self.assertNumQueries(4):
+            data = EnrolmentSummarySerializer(enrolments, many=True).data
+        self.assertEqual(
+            data[0]["session"], SessionSummarySerializer(self.session).data
+        )
+        self.assertEqual(data[0]["enrolled_class"], data[1]["enrolled_class"])
+        self.assertEqual(data[1]["family"], other_family.id)
+
     @patch("enrolments.serializers.validate_student_ids_in_family")
     @patch("enrolments.serializers.validate_class_in_session")
     def test_enrolment_serializer__validate_create(
@@ -0,0 +1,78 @@
+from datetime import date
+from django.test import TestCase
+
+from enrolments.models import AttendanceRecord, Class, Session
+from registration.models import Student
+
+
+class AttendanceRecordTestCase(TestCase):
+    def setUp(self):
+        self.session = Session.objects.create(name="Spring 2021")
+        self.student1 = Student.objects.create(
+            first_name="Nemo", last_name="Fish", role=Student.CHILD
+        )
+        self.student2 = Student.objects.create(
+            first_name="Dory", last_name="Fish", role=Student.GUEST
+        )
+        self.class1 = Class.objects.create(
+            name="Test Class 1",
+            session=self.session,
+            attendance=[
+                {"date": "2021-04-19", "attendees": [self.student1.id]},
+                {
+                    "date": "2021-04-26",
+                    "attendees": [self.student1.id, self.student2.id],
+                },
+            ],
+        )
+
+    def attendance_records(self):
+        return set(self.class1.attendance_records.values_list("date", "student_id"))
+
+    def test_attendance_records_created(self):
+        self.assertEqual(
+            self.attendance_records(),
+            {
+                (date(2021, 4, 19), self.student1.id),
+                (date(2021, 4, 26), self.student1.id),
+                (date(2021, 4, 26), self.student2.id),
+            },
+        )
+        self.assertEqual(
+            AttendanceRecord.objects.filter(student=self.student1).count(), 2
+        )
+        self.assertEqual(
+            AttendanceRecord.objects.filter(date=date(2021, 4, 26)).count(), 2
+        )
+
+    def test_attendance_records_updated(self):
+        unchanged_record = AttendanceRecord.objects.get(
+            student=self.student1, date=date(2021, 4, 19)
+        )
+        self.class1.attendance = [
+            {"date": "2021-04-19", "attendees": [self.student1.id]},
+            {"date": "2021-05-03", "attendees": [self.student2.id]},
+        ]
+        self.class1.save()
+
+        self.assertEqual(
+            self.attendance_records(),
+            {
+                (date(2021, 4, 19), self.student1.id),
+                (date(2021, 5, 3), self.student2.id),
+            },
+        )
+        self.assertTrue(
+            AttendanceRecord.objects.filter(id=unchanged_record.id).exists()
+        )
+
+    def test_attendance_records__invalid_entries_skipped(self):
+        self.class1.attendance = [
+            {"date": "not a date", "attendees": [self.student1.id]},
+            {"date": "2021-04-19", "attendees": [self.student2.id, 0]},
+        ]
+        self.class1.save()
+
+        self.assertEqual(
+            self.attendance_records(), {(date(2021, 4, 19), self.student2.id)}
+        )
@@ -0,0 +1,148 @@
+import datetime
+import io
+import json
+import uuid
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from unittest.mock import patch
+
+from accounts.models import User
+from enrolments.models import Class, Session
+from projectread import renderers
+from projectread.renderers import ORJSONParser, ORJSONRenderer
+from registration.models import Field
+
+
+class ORJSONRendererTestCase(TestCase):
+    data = {
+        "date": datetime.date(2021, 3, 1),
+        "time": datetime.time(9, 30, 15, 250000),
+        "datetime": datetime.datetime(
+            2021, 3, 1, 9, 30, 15, 250000, tzinfo=datetime.timezone.utc
+        ),
+        "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        "decimal": Decimal("12.50"),
+        "lazy": gettext_lazy("Sessions"),
+        "nested": [{1: "Parent", "name": "Élise \u2028 \u2029"}],
+        "float": 0.1,
+        "none": None,
+    }
+
+    def test_render(self):
+        self.assertEqual(
+            ORJSONRenderer().render(self.data), JSONRenderer().render(self.data)
+        )
+
+    def test_render__indent(self):
+        for accepted_media_type, renderer_context in [
+            ("application/json; indent=4", None),
+            ("application/json", {"indent": 2}),
+        ]:
+            self.assertEqual(
+                ORJSONRenderer().render(
+                    self.data, accepted_media_type, renderer_context
+                ),
+                JSONRenderer().render(self.data, accepted_media_type, renderer_context),
+            )
+
+    def test_render__none(self):
+        self.assertEqual(ORJSONRenderer().render(None), b"")
+
+    def test_render__big_int(self):
+        data = {"information": {"1": 2 ** 70}, "date": self.data["date"]}
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_render__no_orjson(self):
+        with patch.object(renderers, "orjson", None):
+            self.assertEqual(
+                ORJSONRenderer().render(self.data), JSONRenderer().render(self.data)
+            )
+
+    def test_parse(self):
+        body = JSONRenderer().render(self.data)
+        self.assertEqual(
+            ORJSONParser().parse(io.BytesIO(body)), JSONParser().parse(io.BytesIO(body))
+        )
+        with patch.object(renderers, "orjson", None):
+            self.assertEqual(
+                ORJSONParser().parse(io.BytesIO(body)),
+                JSONParser().parse(io.BytesIO(body)),
+            )
+
+    def test_parse__big_int(self):
+        body = b'{"information": {"1": %d, "2": %d}}' % (2 ** 70, -(2 ** 70))
+        self.assertEqual(
+            ORJSONParser().parse(io.BytesIO(body)),
+            {"information": {"1": 2 ** 70, "2": -(2 ** 70)}},
+        )
+
+    def test_parse__latin_1(self):
+        body = '{"name": "Élise"}'.encode("latin-1")
+        self.assertEqual(
+            ORJSONParser().parse(
+                io.BytesIO(body), parser_context={"encoding": "latin-1"}
+            ),
+            {"name": "Élise"},
+        )
+
+    def test_parse__error(self):
+        for body in [b'{"name": ', b'{"value": NaN}', b"\xff"]:
+            with self.assertRaisesMessage(ParseError, "JSON parse error"):
+                ORJSONParser().parse(io.BytesIO(body))
+
+
+class ORJSONRendererViewTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(email="user@test.com")
+        self.client.force_authenticate(self.user)
+
+    def test_render_response(self):
+        session = Session.objects.create(name="Spring 2021")
+        response = self.client.get(reverse("session-detail", args=[session.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+        self.assertEqual(response.json()["name"], "Spring 2021")
+
+    def test_parse_request(self):
+        field = Field.objects.create(
+            role=Field.SESSION,
+            name="Ontario Works",
+            question_type=Field.TEXT,
+            is_default=True,
+            order=1,
+        )
+        response = self.client.post(
+            reverse("session-list"),
+            json.dumps(
+                {
+                    "name": "Spring 2021",
+                    "fields": [field.id],
+                    "classes": [
+                        {
+                            "name": "Lower Mon",
+                            "days": [Class.MONDAY],
+                            "location": "Waterloo",
+                            "facilitator": self.user.id,
+                        }
+                    ],
+                }
+            ),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Session.objects.get().name, "Spring 2021")
+
+        response = self.client.post(
+            reverse("session-list"), '{"name": ', content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("JSON parse error", response.json()["detail"])
@@ -1,4 +1,6 @@
 from django.test import TestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
 
 from registration.models import Family, Student
 from enrolments.models import Class, Session, Enrolment
@@ -8,6 +10,7 @@ from enrolments.serializers import (
     ClassListSerializer,
     SessionDetailSerializer,
     EnrolmentSerializer,
+    EnrolmentSummarySerializer,
 )
 from registration.serializers import FamilySerializer
 from enrolments.tests.utils.utils import create_test_classes
@@ -66,13 +69,17 @@ class SessionDetailSerializerTestCase(TestCase):
                     FamilySerializer(
                         self.family,
                         context={
-                            "enrolment": EnrolmentSerializer(self.enrolment).data,
+                            "enrolment": EnrolmentSummarySerializer(
+                                self.enrolment
+                            ).data,
                         },
                     ).data,
                     FamilySerializer(
                         self.other_family,
                         context={
-                            "enrolment": EnrolmentSerializer(self.other_enrolment).data
+                            "enrolment": EnrolmentSummarySerializer(
+                                self.other_enrolment
+                            ).data
                         },
                     ).data,
                 ],
@@ -158,14 +165,18 @@ class ClassDetailSerializerTestCase(TestCase):
                         self.family1,
                         context={
                             "request": None,
-                            "enrolment": EnrolmentSerializer(self.enrolment1).data,
+                            "enrolment": EnrolmentSummarySerializer(
+                                self.enrolment1
+                            ).data,
                         },
                     ).data,
                     FamilySerializer(
                         self.family2,
                         context={
                             "request": None,
-                            "enrolment": EnrolmentSerializer(self.enrolment2).data,
+                            "enrolment": EnrolmentSummarySerializer(
+                                self.enrolment2
+                            ).data,
                         },
                     ).data,
                 ],
@@ -174,6 +185,19 @@ class ClassDetailSerializerTestCase(TestCase):
             ClassDetailSerializer(self.class1, context={"request": None}).data,
         )
 
+    def test_class_detail_serializer__expand_enrolments(self):
+        request = Request(APIRequestFactory().get("/", {"expand": "enrolments"}))
+        families = ClassDetailSerializer(
+            self.class1, context={"request": request}
+        ).data["families"]
+        self.assertEqual(
+            [family["enrolment"] for family in families],
+            [
+                EnrolmentSerializer(self.enrolment1).data,
+                EnrolmentSerializer(self.enrolment2).data,
+            ],
+        )
+
     def test_class_detail_serializer__empty_class(self):
         self.assertEqual(
             {
@@ -1,3 +1,4 @@
+from datetime import date, timedelta
 from django.test import TestCase
 from registration.models import Student, Family, Field
 from accounts.models import User
@@ -224,6 +225,26 @@ class AttendanceValidatorTestCase(TestCase):
         self.assertRaises(ValidationError, validate_attendance, obj2)
         self.assertRaises(ValidationError, validate_attendance, obj3)
 
+    def test_attendance_duplicate_dates(self):
+        obj = [
+            {"date": "2021-04-19", "attendees": []},
+            {"date": "2021-04-19", "attendees": self.student_ids},
+        ]
+        self.assertRaises(ValidationError, validate_attendance, obj)
+
+    def test_attendance_query_count(self):
+        # validation cost should not grow with the number of attendance entries
+        for num_entries in [1, 10, 30]:
+            obj = [
+                {
+                    "date": str(date(2021, 1, 1) + timedelta(weeks=week)),
+                    "attendees": self.student_ids,
+                }
+                for week in range(num_entries)
+            ]
+            with self.assertNumQueries(1):
+                validate_attendance(obj)
+
     def test_fields_exist(self):
         obj1 = self.session.fields
         obj2 = [self.field_ids] + [999]
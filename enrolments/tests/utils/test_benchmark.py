@@ -0,0 +1,91 @@
+import io
+import json
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.urls import reverse
+from unittest.mock import patch
+
+from enrolments.management.commands.benchmark import (
+    DATASET_SIZES,
+    find_query_growth,
+    seeded_dataset,
+)
+from enrolments.models import Session
+from enrolments.views import SessionViewSet
+from registration.models import Family
+
+
+class BenchmarkTestCase(TestCase):
+    def test_seeded_dataset(self):
+        family = Family.objects.create()
+        with seeded_dataset(DATASET_SIZES["small"]) as client:
+            self.assertNotIn(family, Family.objects.all())
+            self.assertEqual(client.get(reverse("family-list")).status_code, 200)
+
+        # load_initial_data's deletes and seeded data are rolled back
+        self.assertEqual(list(Family.objects.all()), [family])
+
+    def test_benchmark(self):
+        stdout = io.StringIO()
+        call_command("benchmark", sizes=["small", "medium"], repeat=1, stdout=stdout)
+        report = json.loads(stdout.getvalue())
+
+        self.assertEqual(list(report["sizes"]), ["small", "medium"])
+        self.assertEqual(report["errors"], [])
+        self.assertEqual(report["query_growth"], [])
+        for size in report["sizes"].values():
+            self.assertIn("family-list", size["endpoints"])
+            self.assertIn("export-attendances?session_id", size["endpoints"])
+            for result in size["endpoints"].values():
+                self.assertEqual(result["status"], 200)
+                self.assertLessEqual(result["p50_ms"], result["p95_ms"])
+                self.assertGreater(result["peak_memory_kb"], 0)
+        self.assertEqual(list(report["authentication"]), ["cold", "cached"])
+        for result in report["authentication"].values():
+            self.assertLessEqual(result["p50_ms"], result["p95_ms"])
+
+    def test_find_query_growth(self):
+        def size(queries):
+            return {
+                "endpoints": {
+                    name: {"queries": num_queries}
+                    for name, num_queries in queries.items()
+                }
+            }
+
+        report = {
+            "sizes": {
+                "small": size({"family-list": 4, "session-list": 2}),
+                "medium": size({"family-list": 4, "session-list": 5}),
+                "large": size({"family-list": 3, "session-list": 9}),
+            }
+        }
+        self.assertEqual(find_query_growth(report), ["session-list"])
+
+    def test_benchmark__query_growth(self):
+        # without prefetching classes, the session list queries once per session
+        with patch.object(SessionViewSet, "queryset", Session.objects.all()):
+            with self.assertRaisesMessage(CommandError, "session-list"):
+                call_command(
+                    "benchmark",
+                    sizes=["small", "medium"],
+                    repeat=1,
+                    stdout=io.StringIO(),
+                )
+
+
+class BenchmarkRenderersTestCase(TestCase):
+    def test_benchmark_renderers(self):
+        stdout = io.StringIO()
+        call_command("benchmark_renderers", size="small", repeat=2, stdout=stdout)
+        report = json.loads(stdout.getvalue())
+
+        self.assertTrue(report["orjson"])
+        self.assertTrue(report["identical"])
+        self.assertGreater(report["payload_kb"], 0)
+        self.assertEqual(list(report["render"]), ["JSONRenderer", "ORJSONRenderer"])
+        self.assertEqual(list(report["parse"]), ["JSONParser", "ORJSONParser"])
+        for result in [*report["render"].values(), *report["parse"].values()]:
+            self.assertLessEqual(result["p50_ms"], result["p95_ms"])
@@ -1,7 +1,9 @@
+import io
+
 from django.core.management import call_command
 from django.test import TestCase
 
-from enrolments.models import Session, Class, Enrolment
+from enrolments.models import Session, Class, Enrolment, parse_attendance
 from registration.models import Family, Field, Student
 
 
@@ -55,3 +57,42 @@ class LoadInitialDataTestCase(TestCase):
         self.assertEqual(Session.objects.all().count(), num_sessions)
         self.assertEqual(Class.objects.all().count(), num_classes)
         self.assertEqual(Enrolment.objects.all().count(), num_families)
+
+    def test_load_initial_data__bulk(self):
+        num_families = 25
+        num_sessions = 2
+        num_classes_per_session = 2
+
+        call_command(
+            "load_initial_data",
+            families=num_families,
+            sessions=num_sessions,
+            classes_per_session=num_classes_per_session,
+            bulk=True,
+            batch_size=10,
+            verbose=False,
+            stdout=io.StringIO(),
+        )
+
+        self.assertEqual(Field.objects.all().count(), 13)
+        self.assertEqual(Family.objects.all().count(), num_families)
+        self.assertEqual(Session.objects.all().count(), num_sessions)
+        self.assertEqual(Class.objects.all().count(), 4)
+        self.assertEqual(Enrolment.objects.all().count(), num_families)
+        # students from before are deleted outright
+        self.assertFalse(Student.all_objects.filter(family=None).exists())
+
+        for family in Family.objects.all():
+            self.assertEqual(family.parent.family, family)
+            self.assertEqual(family.parent.role, Student.PARENT)
+            self.assertIn(len(family.children), [1, 2, 3])
+            self.assertEqual(
+                sorted(family.enrolments.get().students),
+                sorted(family.students.values_list("id", flat=True)),
+            )
+
+        for class_ in Class.objects.all():
+            self.assertEqual(
+                set(class_.attendance_records.values_list("date", "student_id")),
+                parse_attendance(class_.attendance),
+            )
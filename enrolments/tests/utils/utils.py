@@ -1,7 +1,10 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from faker import Faker
 
 from enrolments.models import Session, Class, Enrolment
 from registration.models import Field
+from registration.tests.utils.utils import create_test_family_with_students
 
 fake = Faker()
 Faker.seed(0)
@@ -31,10 +34,10 @@ def create_test_classes(session, num_classes):
                 session=session,
                 attendance=[
                     {
-                        "date": str(fake.date_this_decade()),
+                        "date": str(date),
                         "attendees": [],
                     }
-                    for _ in range(32)
+                    for date in sorted({fake.date_this_decade() for _ in range(32)})
                 ],
                 colour=fake.random_element(
                     elements=[
@@ -65,27 +68,68 @@ def create_test_classes(session, num_classes):
     return Class.objects.bulk_create(classes)
 
 
+def build_test_enrolment(family, session, enrolled_class, students):
+    """
+    Returns an unsaved enrolment of `students` (ids) in `enrolled_class`, and
+    marks a random subset of them as attending each of the class's dates.
+    """
+    for record in enrolled_class.attendance:
+        record["attendees"].extend(fake.random_elements(elements=students, unique=True))
+
+    return Enrolment(
+        family=family,
+        session=session,
+        enrolled_class=enrolled_class,
+        preferred_class=enrolled_class,
+        status=fake.random_element(
+            elements=[status[1] for status in Enrolment.ENROLMENT_STATUSES]
+        ),
+        students=students,
+    )
+
+
 def create_test_enrolments(session, enrolled_class, families):
     enrolments = []
     for family in families:
         students = list(family.students.all().values_list("id", flat=True))
         enrolments.append(
-            Enrolment(
-                family=family,
-                session=session,
-                enrolled_class=enrolled_class,
-                preferred_class=enrolled_class,
-                status=fake.random_element(
-                    elements=[status[1] for status in Enrolment.ENROLMENT_STATUSES]
-                ),
-                students=students,
-            )
+            build_test_enrolment(family, session, enrolled_class, students)
         )
-        for record in enrolled_class.attendance:
-            record["attendees"].extend(
-                fake.random_elements(elements=students, unique=True)
-            )
 
     enrolled_class.save()
 
     Enrolment.objects.bulk_create(enrolments)
+
+
+def create_test_enrolled_families(
+    num_families, session, enrolled_class, last_name=None
+):
+    families = []
+    for _ in range(num_families):
+        family = create_test_family_with_students(
+            num_children=2, num_guests=1, last_name=last_name
+        )
+        Enrolment.objects.create(
+            family=family,
+            session=session,
+            preferred_class=enrolled_class,
+            enrolled_class=enrolled_class,
+        )
+        families.append(family)
+    return families
+
+
+class ConstantQueriesMixin:
+    def assertConstantQueries(self, make_rows, request, small=1, large=10):
+        """
+        Asserts that request() runs as many queries after make_rows(large) as
+        after make_rows(small), and returns its last result.
+        """
+        make_rows(small)
+        with CaptureQueriesContext(connection) as small_queries:
+            request()
+        make_rows(large)
+        with CaptureQueriesContext(connection) as large_queries:
+            result = request()
+        self.assertEqual(len(small_queries), len(large_queries))
+        return result
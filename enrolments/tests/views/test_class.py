@@ -1,3 +1,4 @@
+from datetime import date
 from django.urls import NoReverseMatch, reverse
 from rest_framework import status
 from rest_framework.request import Request
@@ -6,10 +7,15 @@ from rest_framework.test import APITestCase, APIRequestFactory
 from accounts.models import User
 from enrolments.models import Class, Session, Enrolment
 from registration.models import Family, Student
+from registration.tests.utils.utils import create_test_family_with_students
 from enrolments.serializers import ClassDetailSerializer
+from enrolments.tests.utils.utils import (
+    ConstantQueriesMixin,
+    create_test_enrolled_families,
+)
 
 
-class ClassesTestCase(APITestCase):
+class ClassesTestCase(ConstantQueriesMixin, APITestCase):
     def setUp(self):
         self.user = User.objects.create(email="user@staff.com")
         self.session1 = Session.objects.create()
@@ -52,6 +58,126 @@ class ClassesTestCase(APITestCase):
             ClassDetailSerializer(self.class1, context=context).data,
         )
 
+    def test_get_class__query_count(self):
+        url = reverse("class-detail", args=[self.class1.id])
+        self.client.force_authenticate(self.user)
+
+        response = self.assertConstantQueries(
+            lambda num_families: create_test_enrolled_families(
+                num_families, self.session1, self.class1
+            ),
+            lambda: self.client.get(url),
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["families"]), 12)
+
+    def test_get_class__not_modified(self):
+        url = reverse("class-detail", args=[self.class1.id])
+        self.client.force_authenticate(self.user)
+        response = self.client.get(url)
+        etag = response["ETag"]
+
+        # only the validator query runs, covering the class and the families
+        # on its roster with their students, enrolments, sessions and classes
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+        self.student1.delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+
+        self.enrolment1.delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["families"], [])
+
+    def test_get_class__not_modified__scoped(self):
+        url = reverse("class-detail", args=[self.class1.id])
+        self.client.force_authenticate(self.user)
+        etag = self.client.get(url)["ETag"]
+
+        # writes to families, sessions and classes not on the roster don't
+        # change the validators
+        other_family = create_test_family_with_students(num_children=1, num_guests=0)
+        other_family.save()
+        other_class = Class.objects.create(name="Other", session=self.session2)
+        Enrolment.objects.create(
+            family=other_family, session=self.session2, enrolled_class=other_class
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # an enrolment moving out of the class does
+        self.enrolment1.enrolled_class = other_class
+        self.enrolment1.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["families"], [])
+
+    def test_get_class__not_found(self):
+        self.client.force_authenticate(self.user)
+        for pk in [0, "abc"]:
+            response = self.client.get(reverse("class-detail", args=[pk]))
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get_class__if_modified_since(self):
+        url = reverse("class-detail", args=[self.class1.id])
+        self.client.force_authenticate(self.user)
+        last_modified = self.client.get(url)["Last-Modified"]
+
+        # Last-Modified can't tell that a row left the roster, so a 304 is
+        # only sent for a matching ETag
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.enrolment1.delete()
+        response = self.client.get(
+            url,
+            HTTP_IF_MODIFIED_SINCE=last_modified,
+            HTTP_IF_NONE_MATCH=response["ETag"],
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["families"], [])
+
+    def test_get_class__sparse_fields(self):
+        url = reverse("class-detail", args=[self.class1.id])
+        self.client.force_authenticate(self.user)
+
+        # the roster is not built, so only the validators and the class are
+        # queried
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {"fields": "id,name"})
+        self.assertEqual(
+            response.data, {"id": self.class1.id, "name": self.class1.name}
+        )
+
+        response = self.client.get(
+            url, {"fields": "id,families.id,families.enrolment.status"}
+        )
+        self.assertEqual(
+            response.data["families"],
+            [{"id": self.family1.id, "enrolment": {"status": Enrolment.SIGNED_UP}}],
+        )
+
+        # the enrolment's session and class summaries are sparse too
+        response = self.client.get(
+            url,
+            {
+                "fields": "families.enrolment.session.name,"
+                "families.enrolment.enrolled_class.id"
+            },
+        )
+        self.assertEqual(
+            response.data["families"][0]["enrolment"],
+            {
+                "session": {"name": self.session1.name},
+                "enrolled_class": {"id": self.class1.id},
+            },
+        )
+
     def test_update_class(self):
         url = reverse("class-detail", args=[self.class1.id])
         self.client.force_authenticate(self.user)
@@ -64,6 +190,104 @@ class ClassesTestCase(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_update_attendance(self):
+        url = reverse("class-attendance", args=[self.class1.id])
+        self.client.force_authenticate(self.user)
+        student2 = Student.objects.create(
+            first_name="Student2 FirstName",
+            last_name="Student2 LastName",
+            role="Child",
+            family=self.family1,
+        )
+        request = [
+            {
+                "date": "2020-01-01",
+                "present": [student2.id],
+                "absent": [self.student1.id],
+            },
+            {"date": "2020-01-08", "present": [self.student1.id, student2.id]},
+        ]
+        response = self.client.post(url, request, format="json")
+
+        attendance = [
+            {"date": "2020-01-01", "attendees": [student2.id]},
+            {"date": "2020-01-08", "attendees": [self.student1.id, student2.id]},
+        ]
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["attendance"], attendance)
+        self.class1.refresh_from_db()
+        self.assertEqual(self.class1.attendance, attendance)
+        self.assertEqual(
+            set(self.class1.attendance_records.values_list("date__day", "student_id")),
+            {(1, student2.id), (8, self.student1.id), (8, student2.id)},
+        )
+
+    def test_update_attendance__keeps_concurrent_changes(self):
+        # both facilitators loaded the class before either saved
+        first = Class.objects.get(id=self.class1.id)
+        second = Class.objects.get(id=self.class1.id)
+        first.update_attendance(
+            [{"date": date(2020, 1, 8), "present": [self.student1.id], "absent": []}]
+        )
+        second.update_attendance(
+            [{"date": date(2020, 1, 1), "present": [], "absent": [self.student1.id]}]
+        )
+
+        self.class1.refresh_from_db()
+        self.assertEqual(
+            self.class1.attendance,
+            [
+                {"date": "2020-01-01", "attendees": []},
+                {"date": "2020-01-08", "attendees": [self.student1.id]},
+            ],
+        )
+
+    def test_update_attendance__unpadded_date(self):
+        self.class1.attendance = [{"date": "2020-1-8", "attendees": []}]
+        self.class1.save()
+        self.class1.update_attendance(
+            [{"date": date(2020, 1, 8), "present": [self.student1.id], "absent": []}]
+        )
+
+        self.class1.refresh_from_db()
+        self.assertEqual(
+            self.class1.attendance,
+            [{"date": "2020-1-8", "attendees": [self.student1.id]}],
+        )
+        self.assertEqual(
+            list(self.class1.attendance_records.values_list("date", "student_id")),
+            [(date(2020, 1, 8), self.student1.id)],
+        )
+
+    def test_update_attendance__invalid(self):
+        url = reverse("class-attendance", args=[self.class1.id])
+        self.client.force_authenticate(self.user)
+
+        response = self.client.post(
+            url, {"date": "2020-01-08", "present": [0]}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(
+            url,
+            {
+                "date": "2020-01-08",
+                "present": [self.student1.id],
+                "absent": [self.student1.id],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(url, {"date": "2020-13-01"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.class1.refresh_from_db()
+        self.assertEqual(
+            self.class1.attendance,
+            [{"date": "2020-01-01", "attendees": [self.student1.id]}],
+        )
+
     def test_create_class(self):
         url = reverse("class-list")
         self.client.force_authenticate(self.user)
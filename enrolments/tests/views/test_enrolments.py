@@ -1,3 +1,4 @@
+from django.test.utils import override_settings
 from django.urls import NoReverseMatch, reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -5,9 +6,11 @@ from rest_framework.test import APITestCase
 from accounts.models import User
 from enrolments.models import Enrolment, Session, Class
 from registration.models import Family, Student
+from registration.tests.utils.utils import create_test_family_with_students
+from enrolments.tests.utils.utils import ConstantQueriesMixin
 
 
-class EnrolmentsTestCase(APITestCase):
+class EnrolmentsTestCase(ConstantQueriesMixin, APITestCase):
     def setUp(self):
         self.user = User.objects.create(email="user@staff.com")
         parent = Student.objects.create(
@@ -76,6 +79,124 @@ class EnrolmentsTestCase(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_bulk_enrolments(self):
+        url = reverse("enrolment-bulk")
+        self.client.force_authenticate(self.user)
+        other_family = create_test_family_with_students(num_children=1, num_guests=0)
+        request = [
+            {
+                "id": self.enrolment.id,
+                "family": self.family.id,
+                "session": self.session.id,
+                "preferred_class": self.class1.id,
+                "enrolled_class": self.class2.id,
+                "status": Enrolment.CLASS_ALLOCATED,
+                "students": [self.family.parent.id],
+            },
+            {
+                "family": other_family.id,
+                "session": self.session.id,
+                "preferred_class": None,
+                "enrolled_class": self.class1.id,
+                "students": [other_family.parent.id],
+            },
+        ]
+        response = self.client.post(url, request, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.enrolment.refresh_from_db()
+        self.assertEqual(self.enrolment.enrolled_class, self.class2)
+        self.assertEqual(self.enrolment.status, Enrolment.CLASS_ALLOCATED)
+        self.assertEqual(self.enrolment.students, [self.family.parent.id])
+        created = Enrolment.objects.get(family=other_family)
+        self.assertEqual(created.enrolled_class, self.class1)
+        self.assertEqual(created.status, Enrolment.SIGNED_UP)
+        self.assertEqual(
+            [enrolment["id"] for enrolment in response.data],
+            [self.enrolment.id, created.id],
+        )
+        self.assertEqual(response.data[1]["family"], other_family.id)
+
+    def test_bulk_enrolments__invalid(self):
+        url = reverse("enrolment-bulk")
+        self.client.force_authenticate(self.user)
+        other_session = Session.objects.create(name="Fall 2021")
+        other_family = create_test_family_with_students(num_children=1, num_guests=0)
+        valid = {
+            "family": other_family.id,
+            "session": self.session.id,
+            "preferred_class": None,
+            "enrolled_class": self.class1.id,
+        }
+        request = [
+            valid,
+            {**valid, "enrolled_class": 0},
+            {**valid, "session": other_session.id},
+            {**valid, "students": [self.family.parent.id]},
+            {**valid, "id": self.enrolment.id},
+            {**valid, "id": 0},
+        ]
+        response = self.client.post(url, request, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertEqual(
+            response.data[1]["enrolled_class"],
+            ['Invalid pk "0" - object does not exist.'],
+        )
+        self.assertEqual(
+            response.data[2]["enrolled_class"],
+            [f"Class {self.class1.name} is not in session with ID {other_session.id}"],
+        )
+        self.assertIn("students", response.data[3])
+        self.assertEqual(response.data[4]["family"], ["family cannot be updated"])
+        self.assertIn("id", response.data[5])
+        self.assertFalse(Enrolment.objects.filter(family=other_family).exists())
+
+    def test_bulk_enrolments__query_count(self):
+        url = reverse("enrolment-bulk")
+        self.client.force_authenticate(self.user)
+
+        enrolments = []
+
+        def add_enrolments(num_families):
+            families = [
+                create_test_family_with_students(num_children=1, num_guests=1)
+                for _ in range(num_families)
+            ]
+            enrolments[:] = [
+                {
+                    "family": family.id,
+                    "session": self.session.id,
+                    "preferred_class": self.class1.id,
+                    "enrolled_class": self.class2.id,
+                    "students": [family.parent.id, family.children[0].id],
+                }
+                for family in families
+            ]
+
+        response = self.assertConstantQueries(
+            add_enrolments,
+            lambda: self.client.post(url, enrolments, format="json"),
+            small=2,
+            large=20,
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 20)
+
+    @override_settings(MAX_BULK_ENROLMENTS=1)
+    def test_bulk_enrolments__too_many(self):
+        url = reverse("enrolment-bulk")
+        self.client.force_authenticate(self.user)
+        enrolment = {
+            "family": self.family.id,
+            "session": self.session.id,
+            "preferred_class": None,
+            "enrolled_class": None,
+        }
+        response = self.client.post(url, [enrolment, enrolment], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_method_not_allowed(self):
         self.client.force_authenticate(self.user)
         url = reverse("enrolment-detail", args=[self.enrolment.id])
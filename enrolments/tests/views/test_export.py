@@ -0,0 +1,127 @@
+import csv
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from enrolments.models import Class, Session
+from registration.models import Student
+
+
+def read_csv(response):
+    content = b"".join(response.streaming_content).decode()
+    return list(csv.reader(content.splitlines()))
+
+
+class ExportTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(email="user@staff.com")
+        self.session = Session.objects.create(name="Spring 2021")
+        self.class1 = Class.objects.create(
+            name="Test Class 1",
+            session=self.session,
+            days=[Class.MONDAY, Class.WEDNESDAY],
+            attendance=[{"date": "2020-01-01", "attendees": []}],
+        )
+        self.student1 = Student.objects.create(
+            first_name="Nemo", last_name="Fish", role=Student.CHILD
+        )
+        self.student2 = Student.objects.create(
+            first_name="Dory", last_name="Fish", role=Student.GUEST
+        )
+        self.class2 = Class.objects.create(
+            name="Test Class 2",
+            session=self.session,
+            attendance=[
+                {"date": "2020-01-08", "attendees": [self.student1.id]},
+                {
+                    "date": "2020-01-01",
+                    "attendees": [self.student1.id, self.student2.id],
+                },
+            ],
+        )
+
+    def test_export_classes(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get(reverse("export-classes"))
+        header, *rows = read_csv(response)
+        rows = [dict(zip(header, row)) for row in rows]
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            header,
+            sorted(
+                [
+                    field.name
+                    for field in Class._meta.concrete_fields
+                    if field.name not in ["attendance", "days"]
+                ]
+                + ["days.0", "days.1"]
+            ),
+        )
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]["name"], self.class1.name)
+        self.assertEqual(rows[0]["session"], str(self.session.id))
+        self.assertEqual(rows[0]["days.0"], Class.MONDAY)
+        self.assertEqual(rows[0]["days.1"], Class.WEDNESDAY)
+
+    def test_export_attendances__class(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get(
+            reverse("export-attendances"), {"class_id": self.class2.id}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            read_csv(response),
+            [
+                ["student_id", "first_name", "last_name", "2020-01-01", "2020-01-08"],
+                [str(self.student2.id), "Dory", "Fish", "1", "0"],
+                [str(self.student1.id), "Nemo", "Fish", "1", "1"],
+            ],
+        )
+
+    def test_export_attendances__session(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get(
+            reverse("export-attendances"), {"session_id": self.session.id}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        header, *rows = read_csv(response)
+        self.assertEqual(
+            header,
+            [
+                "class_id",
+                "class_name",
+                "student_id",
+                "first_name",
+                "last_name",
+                "2020-01-01",
+                "2020-01-08",
+            ],
+        )
+        self.assertEqual(
+            rows,
+            [
+                [str(self.class2.id), "Test Class 2", str(self.student2.id)]
+                + ["Dory", "Fish", "1", "0"],
+                [str(self.class2.id), "Test Class 2", str(self.student1.id)]
+                + ["Nemo", "Fish", "1", "1"],
+            ],
+        )
+
+    def test_export_attendances__no_params(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get(reverse("export-attendances"))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_attendances__invalid_params(self):
+        self.client.force_authenticate(self.user)
+        for params in [{"class_id": "abc"}, {"session_id": "1.5"}]:
+            response = self.client.get(reverse("export-attendances"), params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(reverse("export-attendances"), {"class_id": 0})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -1,4 +1,6 @@
 from datetime import date
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -7,9 +9,13 @@ from accounts.models import User
 from enrolments.models import Class, Session
 from registration.models import Field
 from enrolments.serializers import SessionListSerializer, SessionDetailSerializer
+from enrolments.tests.utils.utils import (
+    ConstantQueriesMixin,
+    create_test_enrolled_families,
+)
 
 
-class SessionTestCase(APITestCase):
+class SessionTestCase(ConstantQueriesMixin, APITestCase):
     def setUp(self):
         Field.objects.bulk_create(
             [
@@ -52,8 +58,31 @@ class SessionTestCase(APITestCase):
             name="Summer 2021", start_date=None
         )
 
+    def test_get_all_sessions__paginated(self):
+        url = reverse("session-list") + "?page_size=2"
+        self.client.force_authenticate(self.user)
+        response = self.client.get(url)
+        payload = response.json()
+
+        # pages are ordered by creation
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            payload["results"],
+            [
+                SessionListSerializer(self.session).data,
+                SessionListSerializer(self.older_session).data,
+            ],
+        )
+
+        payload = self.client.get(payload["next"]).json()
+        self.assertEqual(
+            payload["results"],
+            [SessionListSerializer(self.session_no_start_date).data],
+        )
+        self.assertIsNone(payload["next"])
+
     def test_get_all_sessions(self):
-        url = reverse("session-list")
+        url = reverse("session-list") + "?paginate=false"
         self.client.force_authenticate(self.user)
         response = self.client.get(url)
         payload = response.json()
@@ -70,6 +99,54 @@ class SessionTestCase(APITestCase):
             ],
         )
 
+    def test_get_all_sessions__not_modified(self):
+        url = reverse("session-list")
+        self.client.force_authenticate(self.user)
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # each page has its own validator
+        response = self.client.get(url + "?page_size=1", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        Class.objects.create(name="Class", session=self.session)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_get_session__not_modified(self):
+        url = reverse("session-detail", args=[self.session.id])
+        self.client.force_authenticate(self.user)
+        etag = self.client.get(url)["ETag"]
+
+        # classes of other sessions aren't rendered
+        Class.objects.create(name="Class", session=self.older_session)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Class.objects.create(name="Class", session=self.session)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()["classes"]), 1)
+
+    def test_get_all_sessions__sparse_fields(self):
+        url = reverse("session-list")
+        self.client.force_authenticate(self.user)
+        Class.objects.create(name="Class", session=self.session)
+
+        with CaptureQueriesContext(connection) as all_fields:
+            self.client.get(url)
+        with CaptureQueriesContext(connection) as sparse_fields:
+            response = self.client.get(url, {"fields": "id,name"})
+
+        self.assertEqual(
+            response.json()["results"][0],
+            {"id": self.session.id, "name": self.session.name},
+        )
+        # classes are not prefetched
+        self.assertEqual(len(sparse_fields), len(all_fields) - 1)
+
     def test_get_session(self):
         url = reverse("session-detail", args=[self.session.id])
         self.client.force_authenticate(self.user)
@@ -79,6 +156,20 @@ class SessionTestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(payload, SessionDetailSerializer(self.session).data)
 
+    def test_get_session__query_count(self):
+        url = reverse("session-detail", args=[self.session.id])
+        self.client.force_authenticate(self.user)
+        session_class = Class.objects.create(name="Roster", session=self.session)
+
+        response = self.assertConstantQueries(
+            lambda num_families: create_test_enrolled_families(
+                num_families, self.session, session_class
+            ),
+            lambda: self.client.get(url),
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()["families"]), 11)
+
     def test_create_session(self):
         url = reverse("session-list")
         self.client.force_authenticate(self.user)
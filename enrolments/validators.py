@@ -1,6 +1,7 @@
 from datetime import datetime
 from django.core.exceptions import ValidationError
-from registration.models import Student, Field
+from registration.field_cache import get_field_roles
+from registration.models import Student
 from django.apps import apps
 
 
@@ -61,9 +62,12 @@ def validate_attendance(class_obj):
     schema = [{"date": "str", "attendees": ["int"]}]
     if not validate_schema(class_obj, schema):
         raise ValidationError("invalid json structure", code="invalid_schema")
+
+    # check every date in a single pass, then check all attendees in one query
+    dates = set()
+    attendees = set()
     for session in class_obj:
         date = session["date"]
-        attendees = session["attendees"]
         try:
             datetime.strptime(date, "%Y-%m-%d").date()
         except ValueError:
@@ -71,12 +75,21 @@ def validate_attendance(class_obj):
                 date + " must be formatted as YYYY-MM-DD and must be a valid date",
                 code="invalid_date",
             )
-        if attendees and not set(
+        if date in dates:
+            raise ValidationError(
+                date + " appears more than once", code="duplicate_date"
+            )
+        dates.add(date)
+        attendees.update(session["attendees"])
+
+    if attendees:
+        missing_attendees = attendees - set(
             Student.objects.filter(pk__in=attendees).values_list("id", flat=True)
-        ) == set(attendees):
+        )
+        if missing_attendees:
             raise ValidationError(
                 "one or more of the following attendee IDs do not exist: "
-                + str(attendees),
+                + str(sorted(missing_attendees)),
                 code="invalid_attendee",
             )
 
@@ -93,9 +106,7 @@ def validate_fields(fields_list):
     schema = ["int"]
     if not validate_schema(fields_list, schema):
         raise ValidationError("invalid json structure", code="invalid_schema")
-    if fields_list and not set(
-        Field.objects.filter(pk__in=fields_list).values_list("id", flat=True)
-    ) == set(fields_list):
+    if fields_list and not set(get_field_roles(fields_list)) == set(fields_list):
         raise ValidationError(
             "one or more of the following field IDs do not exist: " + str(fields_list),
             code="invalid_field",
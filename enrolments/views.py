@@ -1,32 +1,74 @@
+import csv
+
 from django.db.models import F
-from rest_framework import mixins, permissions, viewsets
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from rest_framework import mixins, permissions, status, viewsets
+from rest_framework.decorators import action
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework_csv import renderers as r
 
+from projectread.conditional import (
+    ConditionalListModelMixin,
+    ConditionalRetrieveModelMixin,
+)
+from projectread.exports import Echo, StreamingCSVExportView
+from projectread.pagination import CursorPagination
+from projectread.serializers import get_requested_fields
+from registration.models import Family, Student
 from .models import Class, Enrolment, Session
 from .serializers import (
+    AttendanceChangeSerializer,
     SessionListSerializer,
     SessionDetailSerializer,
     SessionCreateSerializer,
     ClassDetailSerializer,
     ClassCreateSerializer,
     EnrolmentSerializer,
+    EnrolmentBulkSerializer,
 )
 
 
+class SessionPagination(CursorPagination):
+    # sessions created before created_at was added have no timestamp, and a
+    # cursor cannot point at a null; ids follow creation order as well
+    ordering = ("id",)
+
+
 class SessionViewSet(
     viewsets.GenericViewSet,
-    mixins.ListModelMixin,
-    mixins.RetrieveModelMixin,
+    ConditionalListModelMixin,
+    ConditionalRetrieveModelMixin,
     mixins.CreateModelMixin,
 ):
-    queryset = Session.objects.all().order_by(F("start_date").asc(nulls_last=True))
+    queryset = Session.objects.prefetch_related("classes").order_by(
+        F("start_date").asc(nulls_last=True)
+    )
     http_method_names = [
         "get",
         "post",
     ]
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = SessionPagination
+
+    def get_queryset(self):
+        fields = get_requested_fields(self.request)
+        if fields is not None and "classes" not in fields:
+            return self.queryset.prefetch_related(None)
+        return super().get_queryset()
+
+    def get_conditional_querysets(self):
+        if self.action == "retrieve":
+            sessions = self.filter_to_object(Session.objects.all())
+            return [
+                sessions,
+                Class.objects.filter(session__in=sessions),
+                *Family.objects.filter(
+                    enrolments__session__in=sessions, enrolments__is_guest=False
+                ).related_querysets(),
+            ]
+        return [Session.objects.all(), Class.objects.all()]
 
     def get_serializer_class(self):
         if self.action == "retrieve":
@@ -38,7 +80,7 @@ class SessionViewSet(
 
 class ClassViewSet(
     viewsets.GenericViewSet,
-    mixins.RetrieveModelMixin,
+    ConditionalRetrieveModelMixin,
     mixins.UpdateModelMixin,
     mixins.CreateModelMixin,
 ):
@@ -51,11 +93,42 @@ class ClassViewSet(
     ]
     permission_classes = [permissions.IsAuthenticated]
 
+    def get_conditional_querysets(self):
+        classes = self.filter_to_object(Class.objects.all())
+        return [
+            classes,
+            *Family.objects.filter(
+                enrolments__enrolled_class__in=classes
+            ).related_querysets(),
+        ]
+
     def get_serializer_class(self):
         if self.action == "create":
             return ClassCreateSerializer
+        elif self.action == "attendance":
+            return AttendanceChangeSerializer
         return ClassDetailSerializer
 
+    @action(
+        methods=["post"],
+        detail=True,
+        permission_classes=[permissions.IsAuthenticated],
+        url_path="attendance",
+        url_name="attendance",
+    )
+    def attendance(self, request, pk=None):
+        """
+        Marks students present or absent on one or more dates without sending
+        the whole attendance JSON, e.g.
+        [{"date": "2021-04-19", "present": [1, 2], "absent": [3]}]
+        """
+        class_obj = self.get_object()
+        data = request.data if isinstance(request.data, list) else [request.data]
+        serializer = self.get_serializer(data=data, many=True)
+        serializer.is_valid(raise_exception=True)
+        class_obj.update_attendance(serializer.validated_data)
+        return Response({"id": class_obj.id, "attendance": class_obj.attendance})
+
 
 class EnrolmentViewSet(
     viewsets.GenericViewSet, mixins.CreateModelMixin, mixins.UpdateModelMixin
@@ -68,26 +141,32 @@ class EnrolmentViewSet(
     permission_classes = [permissions.IsAuthenticated]
 
     def get_serializer_class(self):
+        if self.action == "bulk":
+            return EnrolmentBulkSerializer
         return EnrolmentSerializer
 
-
-class ExportClassesView(APIView):
+    @action(
+        methods=["post"],
+        detail=False,
+        permission_classes=[permissions.IsAuthenticated],
+        url_path="bulk",
+        url_name="bulk",
+    )
+    def bulk(self, request):
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data)
+
+
+class ExportClassesView(StreamingCSVExportView):
     queryset = Class.objects.all()
-    renderer_classes = [r.CSVRenderer]
+    exclude = ["attendance"]
 
-    def get(self, request, format=None):
-        # return all fields except attendance
-        return Response(
-            list(
-                Class.objects.values(
-                    *[
-                        field.name
-                        for field in Class._meta.fields
-                        if field.name != "attendance"
-                    ]
-                )
-            )
-        )
+    def get_column_name(self, field):
+        # the class export has always named its columns after the fields,
+        # e.g. session rather than session_id
+        return field.name
 
 
 class ExportAttendancesView(APIView):
@@ -95,36 +174,82 @@ class ExportAttendancesView(APIView):
     renderer_classes = [r.CSVRenderer]
 
     def get(self, request, format=None):
-        class_id = request.query_params.get("class_id")
-        attendance = Class.objects.get(pk=class_id).attendance
-        # Transform to {date: set_of_attendees, ...}
-        attendance = {obj["date"]: set(obj["attendees"]) for obj in attendance}
-        # flatten attendance.values() to get set of attendees
-        attendees = set(
-            attendee
-            for attendees in list(attendance.values())
-            for attendee in attendees
+        try:
+            class_id, session_id = [
+                int(request.query_params[param])
+                if request.query_params.get(param)
+                else None
+                for param in ["class_id", "session_id"]
+            ]
+        except ValueError:
+            return Response(
+                "class_id and session_id must be integers.",
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if class_id is not None:
+            classes = [get_object_or_404(Class, pk=class_id)]
+        elif session_id is not None:
+            session = get_object_or_404(Session, pk=session_id)
+            classes = list(session.classes.order_by("id"))
+        else:
+            return Response(
+                "A class_id or session_id is required.",
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return StreamingHttpResponse(
+            self.stream_rows(classes, include_class=not class_id),
+            content_type="text/csv",
         )
-        res = []
-        for attendee in attendees:
-            attendee_attendance = {"student_id": attendee}
-            for date in attendance.keys():
-                attendee_attendance[date] = 1 if attendee in attendance[date] else 0
-            res.append(attendee_attendance)
-        return Response(res)
 
+    def stream_rows(self, classes, include_class=False):
+        # Build the date columns once, then fill a dense 0/1 student x date
+        # matrix in a single pass over each class's attendance JSON
+        dates = sorted({record["date"] for c in classes for record in c.attendance})
+        date_index = {date: i for i, date in enumerate(dates)}
+        row_index = {}
+        matrix = []
+        for class_obj in classes:
+            for record in class_obj.attendance:
+                col = date_index[record["date"]]
+                for student_id in record["attendees"]:
+                    key = (class_obj.id, student_id)
+                    if key not in row_index:
+                        row_index[key] = len(matrix)
+                        matrix.append(bytearray(len(dates)))
+                    matrix[row_index[key]][col] = 1
+
+        # deleted students are included so that historical attendance is kept
+        names = {
+            student_id: (first_name, last_name)
+            for student_id, first_name, last_name in Student.all_objects.filter(
+                pk__in={student_id for _, student_id in row_index}
+            ).values_list("id", "first_name", "last_name")
+        }
+        class_names = {class_obj.id: class_obj.name for class_obj in classes}
+
+        rows = sorted(
+            (class_id, *names.get(student_id, ("", "")), student_id, row)
+            for (class_id, student_id), row in row_index.items()
+        )
 
-class ExportEnrolmentsView(APIView):
-    queryset = Enrolment.objects.all()
-    renderer_classes = [r.CSVRenderer]
+        writer = csv.writer(Echo())
+        class_header = ["class_id", "class_name"] if include_class else []
+        yield writer.writerow(
+            class_header + ["student_id", "first_name", "last_name"] + dates
+        )
+        # rows are ordered by class, then by student name
+        for class_id, first_name, last_name, student_id, row in rows:
+            class_columns = [class_id, class_names[class_id]] if include_class else []
+            yield writer.writerow(
+                class_columns + [student_id, first_name, last_name] + list(matrix[row])
+            )
 
-    def get(self, request, format=None):
-        return Response(list(Enrolment.objects.values()))
 
+class ExportEnrolmentsView(StreamingCSVExportView):
+    queryset = Enrolment.objects.all()
 
-class ExportSessionsView(APIView):
-    queryset = Session.objects.all()
-    renderer_classes = [r.CSVRenderer]
 
-    def get(self, request, format=None):
-        return Response(list(Session.objects.values()))
+class ExportSessionsView(StreamingCSVExportView):
+    queryset = Session.objects.all()
@@ -0,0 +1,55 @@
+import io
+import math
+import time
+
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from projectread import renderers
+from projectread.renderers import ORJSONParser, ORJSONRenderer
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    return values[max(0, math.ceil(percent / 100 * len(values)) - 1)]
+
+
+def time_calls(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {
+        "p50_ms": round(percentile(timings, 50) * 1000, 3),
+        "p95_ms": round(percentile(timings, 95) * 1000, 3),
+    }
+
+
+def benchmark_renderers(data, repeat):
+    """
+    Times DRF's JSONRenderer and JSONParser against the orjson ones on `data`.
+    """
+    rendered = {
+        renderer_class.__name__: renderer_class().render(data)
+        for renderer_class in [JSONRenderer, ORJSONRenderer]
+    }
+    body = rendered[JSONRenderer.__name__]
+
+    return {
+        "orjson": renderers.orjson is not None,
+        "payload_kb": round(len(body) / 1024, 1),
+        "identical": len(set(rendered.values())) == 1,
+        "render": {
+            renderer_class.__name__: time_calls(
+                lambda: renderer_class().render(data), repeat
+            )
+            for renderer_class in [JSONRenderer, ORJSONRenderer]
+        },
+        "parse": {
+            parser_class.__name__: time_calls(
+                lambda: parser_class().parse(io.BytesIO(body)), repeat
+            )
+            for parser_class in [JSONParser, ORJSONParser]
+        },
+    }
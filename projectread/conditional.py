@@ -0,0 +1,112 @@
+import hashlib
+
+from django.core.exceptions import EmptyResultSet, ValidationError
+from django.db import connections
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import mixins
+
+
+def aggregate(querysets):
+    """
+    Returns (latest updated_at, row count) for each queryset, in one query.
+    """
+    results = [(None, 0)] * len(querysets)
+    tables = []
+    params = []
+    indexes = []
+    for index, queryset in enumerate(querysets):
+        try:
+            query = queryset.order_by().values("pk").query
+            sql, pk_params = query.sql_with_params()
+        except EmptyResultSet:
+            continue
+        connection = connections[queryset.db]
+        quote_name = connection.ops.quote_name
+        opts = queryset.model._meta
+        tables.append(
+            "(SELECT MAX(%s), COUNT(*) FROM %s WHERE %s IN (%s)) AS t%d"
+            % (
+                quote_name(opts.get_field("updated_at").column),
+                quote_name(opts.db_table),
+                quote_name(opts.pk.column),
+                sql,
+                index,
+            )
+        )
+        params += pk_params
+        indexes.append(index)
+
+    if tables:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT * FROM %s" % ", ".join(tables), params)
+            row = cursor.fetchone()
+        for i, index in enumerate(indexes):
+            results[index] = (row[2 * i], row[2 * i + 1])
+    return results
+
+
+class ConditionalGetMixin:
+    """
+    Adds ETag and Last-Modified headers to GET responses and answers a
+    matching If-None-Match with 304, from the latest updated_at and row count
+    of each of get_conditional_querysets.
+    """
+
+    conditional_models = []
+
+    def get_conditional_models(self):
+        return self.conditional_models
+
+    def get_conditional_querysets(self):
+        return [
+            getattr(model, "all_objects", model._default_manager).all()
+            for model in self.get_conditional_models()
+        ]
+
+    def filter_to_object(self, queryset):
+        # an invalid lookup matches nothing, and the handler responds with 404
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            return queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (TypeError, ValueError, ValidationError):
+            return queryset.none()
+
+    def get_conditional_state(self):
+        # anything else the ETag depends on, e.g. pagination links
+        return []
+
+    def get_validators(self, request):
+        last_modified = None
+        state = [request.get_full_path(), request.accepted_media_type]
+        querysets = self.get_conditional_querysets()
+        for queryset, (updated_at, count) in zip(querysets, aggregate(querysets)):
+            if updated_at and (last_modified is None or updated_at > last_modified):
+                last_modified = updated_at
+            state += [queryset.model._meta.label, updated_at, count]
+        state += self.get_conditional_state()
+
+        etag = quote_etag(hashlib.md5(repr(state).encode()).hexdigest())
+        # HTTP dates are in whole seconds
+        return etag, last_modified and int(last_modified.timestamp())
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in [200, 304]:
+            response["ETag"] = etag
+            if last_modified:
+                response["Last-Modified"] = http_date(last_modified)
+        return response
+
+
+class ConditionalListModelMixin(ConditionalGetMixin, mixins.ListModelMixin):
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, **kwargs)
+
+
+class ConditionalRetrieveModelMixin(ConditionalGetMixin, mixins.RetrieveModelMixin):
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,23 @@
+from django.conf import settings
+from rest_framework import pagination
+
+
+class CursorPagination(pagination.CursorPagination):
+    """
+    Cursor pagination over a stable ordering, `(created_at, id)` unless a
+    subclass sets its own. The page size defaults to DEFAULT_PAGE_SIZE and can
+    be set with `?page_size=`, up to MAX_PAGE_SIZE.
+
+    Clients that still expect the whole list can pass `?paginate=false`, which
+    returns the unpaginated results in the view's own ordering.
+    """
+
+    ordering = ("created_at", "id")
+    page_size = settings.DEFAULT_PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = settings.MAX_PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if request.query_params.get("paginate") == "false":
+            return None
+        return super().paginate_queryset(queryset, request, view)
@@ -0,0 +1,78 @@
+import io
+import re
+
+from django.conf import settings
+from rest_framework import parsers, renderers
+from rest_framework.exceptions import ParseError
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson parses integers beyond 64 bits as floats; any integer with this many
+# digits may be one of them (2 ** 63 has 19)
+BIG_INT_RE = re.compile(rb"\d{19,}")
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when it is installed, and with the
+    standard library otherwise, when indented output is asked for (e.g. by
+    the browsable API) or when orjson can't encode the data (e.g. integers
+    beyond 64 bits, which can be stored in the `information` JSONFields).
+
+    Types orjson does not handle natively (Decimals, lazy strings, querysets)
+    go through DRF's JSONEncoder, as do datetimes so that they are formatted
+    the same way, so responses are identical to JSONRenderer's.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except (orjson.JSONEncodeError, TypeError):
+            return super().render(data, accepted_media_type, renderer_context)
+        # escape \u2028 and \u2029 as JSONRenderer does, so that the output is
+        # valid javascript
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028")
+            ret = ret.replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+
+
+class ORJSONParser(parsers.JSONParser):
+    """
+    JSONParser that decodes UTF-8 request bodies with orjson when it is
+    installed. orjson rejects NaN and Infinity, as the strict JSONParser does.
+
+    Bodies that may hold integers beyond 64 bits, which orjson would parse as
+    floats, go through JSONParser so that they keep their exact value.
+    """
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or not self.strict or encoding.lower() != "utf-8":
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        if BIG_INT_RE.search(body):
+            return super().parse(io.BytesIO(body), media_type, parser_context)
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
@@ -0,0 +1,69 @@
+def get_param_names(request, param):
+    if request is None:
+        return []
+    return [name for name in request.query_params.get(param, "").split(",") if name]
+
+
+def get_expanded(request):
+    """
+    Returns the names passed in a request's comma-separated `?expand=`
+    parameter, e.g. {"enrolments"} for `?expand=enrolments`.
+    """
+    return set(get_param_names(request, "expand"))
+
+
+def get_requested_fields(request, path=()):
+    """
+    Returns the names of the fields requested with `?fields=` for the
+    serializer at `path`, or None if it should render all of its fields.
+    Nested fields are requested with dots: `?fields=id,families.parent`
+    renders `id` and `families` at the top level and only the `parent` of
+    each family.
+    """
+    if request is None or request.method != "GET":
+        return None
+    path = list(path)
+    requested = set()
+    for name in get_param_names(request, "fields"):
+        parts = name.split(".")
+        if parts[: len(path)] == path and len(parts) > len(path):
+            requested.add(parts[len(path)])
+    return requested or None
+
+
+class SparseFieldsetsMixin:
+    """
+    Renders only the fields requested with `?fields=` (see
+    get_requested_fields). The others are dropped before serialization, so
+    their nested serializers and SerializerMethodFields never run or query.
+    Serializers created inside a SerializerMethodField are passed
+    get_nested_context, so that they know where they are nested.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        requested = get_requested_fields(
+            self.context.get("request"), self.get_field_path()
+        )
+        if requested is None:
+            return fields
+        return {name: field for name, field in fields.items() if name in requested}
+
+    def get_field_path(self):
+        path = []
+        serializer = self
+        while serializer.parent is not None:
+            if serializer.field_name:
+                path.insert(0, serializer.field_name)
+            serializer = serializer.parent
+        return self.context.get("field_path", []) + path
+
+    def get_nested_context(self, field_name, **context):
+        # share the map of already serialized sessions and classes (see
+        # EnrolmentSerializer.summarize) with the nested serializer
+        self.context.setdefault("summaries", {})
+        return {
+            **self.context,
+            "field_path": self.get_field_path() + [field_name],
+            **context,
+        }
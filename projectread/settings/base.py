@@ -43,6 +43,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "rest_framework_swagger",
     "corsheaders",
@@ -129,8 +130,55 @@ REST_FRAMEWORK = {
     ]
     if DEBUG
     else ["accounts.authentication.FirebaseAuthentication"],
+    # Encode and decode JSON with orjson when it is installed (see
+    # projectread.renderers)
+    "DEFAULT_RENDERER_CLASSES": [
+        "projectread.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "projectread.renderers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 
+# Page sizes for the paginated list endpoints (see projectread.pagination)
+DEFAULT_PAGE_SIZE = env.int("DEFAULT_PAGE_SIZE", default=50)
+MAX_PAGE_SIZE = env.int("MAX_PAGE_SIZE", default=200)
+
+# Cache
+# https://docs.djangoproject.com/en/3.1/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # shared by every worker process; created with ./manage.py createcachetable
+    "shared": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "cache",
+    },
+}
+
+# Cache used for verified Firebase ID tokens, and the maximum number of seconds
+# a verified token is trusted before it is verified again
+FIREBASE_TOKEN_CACHE = "default"
+FIREBASE_TOKEN_CACHE_TIMEOUT = env.int("FIREBASE_TOKEN_CACHE_TIMEOUT", default=300)
+
+# Cache the active Field definitions are shared through, which should be shared
+# between processes (a per-process cache logs a warning), and the number of
+# seconds a process uses its own copy before checking that they haven't changed
+# (see registration.field_cache)
+FIELD_CACHE = "shared"
+FIELD_CACHE_CHECK_INTERVAL = env.int("FIELD_CACHE_CHECK_INTERVAL", default=5)
+
+# Maximum number of enrolments accepted by POST /enrolments/bulk/
+MAX_BULK_ENROLMENTS = env.int("MAX_BULK_ENROLMENTS", default=1000)
+
+# Maximum number of results returned by GET /families/search/?query=
+FAMILY_SEARCH_LIMIT = env.int("FAMILY_SEARCH_LIMIT", default=20)
+
 # Internationalization
 # https://docs.djangoproject.com/en/3.1/topics/i18n/
 
@@ -3,3 +3,9 @@ from django.apps import AppConfig
 
 class RegistrationConfig(AppConfig):
     name = "registration"
+
+    def ready(self):
+        from . import signals
+        from .field_cache import check_cache_backend
+
+        check_cache_backend()
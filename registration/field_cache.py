@@ -0,0 +1,176 @@
+import logging
+import threading
+import time
+import uuid
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "registration:fields:version"
+DEFINITIONS_KEY = "registration:fields:definitions"
+
+# backends that are private to each process, so can't tell other processes
+# that the definitions changed
+PER_PROCESS_BACKENDS = [
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+]
+
+_local = None
+_local_lock = threading.Lock()
+
+
+class FieldDefinitions:
+    """
+    The active (not deleted) Field definitions, as dicts of their values,
+    indexed by id and by role. Each role's fields are sorted by order.
+    `missing` holds the ids that were looked up and found to be deleted or
+    unknown at this version.
+    """
+
+    def __init__(self, fields, missing=()):
+        self.by_id = {field["id"]: field for field in fields}
+        self.missing = {field_id for field_id in missing if field_id not in self.by_id}
+        self.by_role = {}
+        for field in sorted(fields, key=lambda field: (field["order"], field["id"])):
+            self.by_role.setdefault(field["role"], []).append(field)
+
+
+def get_cache():
+    return caches[settings.FIELD_CACHE]
+
+
+def check_cache_backend():
+    """
+    Warns if FIELD_CACHE is private to each process. The definitions are then
+    only cached per process, so a change is only seen by the process that made
+    it.
+    """
+    backend = settings.CACHES[settings.FIELD_CACHE]["BACKEND"]
+    if backend in PER_PROCESS_BACKENDS:
+        logger.warning(
+            "FIELD_CACHE is a %s, so Field changes are only seen by the process "
+            "that made them.",
+            backend,
+        )
+
+
+def get_version(cache):
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # first use, or the key was evicted: start a new version, unless
+        # another process just did
+        cache.add(VERSION_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def load_field_definitions():
+    Field = apps.get_model("registration", "Field")
+    return list(
+        Field.objects.values(
+            "id",
+            "role",
+            "name",
+            "question",
+            "question_type",
+            "is_default",
+            "options",
+            "order",
+        )
+    )
+
+
+def get_field_definitions(reload=False, missing=()):
+    """
+    Returns the FieldDefinitions, without querying the database unless they
+    changed since they were last loaded.
+
+    Each process keeps its own copy, tagged with the version it was loaded at,
+    and checks it against the current version in FIELD_CACHE at most every
+    FIELD_CACHE_CHECK_INTERVAL seconds. The definitions themselves are shared
+    through FIELD_CACHE too, so a change made by one process is picked up by
+    the others within that interval. Pass reload=True to load them from the
+    database regardless, e.g. after rows were written without signals, with
+    the ids that should be remembered as missing.
+    """
+    global _local
+    local = _local
+    now = time.monotonic()
+    if (
+        not reload
+        and local is not None
+        and now - local[2] < settings.FIELD_CACHE_CHECK_INTERVAL
+    ):
+        return local[1]
+
+    cache = get_cache()
+    version = get_version(cache)
+    if not reload and local is not None and local[0] == version:
+        with _local_lock:
+            _local = (version, local[1], now)
+        return local[1]
+
+    shared = None if reload else cache.get(DEFINITIONS_KEY)
+    if shared is not None and shared[0] == version:
+        fields = shared[1]
+    else:
+        fields = load_field_definitions()
+        # tag with the version read before loading, so that definitions
+        # loaded while a field was being saved are reloaded on the next lookup
+        cache.set(DEFINITIONS_KEY, (version, fields), timeout=None)
+
+    definitions = FieldDefinitions(fields, missing)
+    with _local_lock:
+        _local = (version, definitions, now)
+    return definitions
+
+
+def get_field_roles(field_ids):
+    """
+    Returns a dict of each active field's role by id, for the given ids.
+    Fields missing from the cached definitions are looked up again once, as
+    bulk_create and queryset updates do not send the signals that invalidate
+    them. Ids that are still missing (deleted or unknown fields) are left out,
+    and remembered so that they are not looked up again until the definitions
+    change.
+    """
+    definitions = get_field_definitions()
+    unknown = {
+        field_id
+        for field_id in field_ids
+        if field_id not in definitions.by_id and field_id not in definitions.missing
+    }
+    if unknown:
+        definitions = get_field_definitions(
+            reload=True, missing=definitions.missing | unknown
+        )
+    return {
+        field_id: definitions.by_id[field_id]["role"]
+        for field_id in field_ids
+        if field_id in definitions.by_id
+    }
+
+
+def invalidate_field_definitions():
+    """
+    Starts a new version, so every process reloads the definitions on its
+    next lookup.
+    """
+    cache = get_cache()
+    cache.set(VERSION_KEY, uuid.uuid4().hex, timeout=None)
+    cache.delete(DEFINITIONS_KEY)
+    clear()
+
+
+def clear():
+    """
+    Forgets this process's copy of the definitions, e.g. between tests, whose
+    rolled back changes never invalidate it.
+    """
+    global _local
+    with _local_lock:
+        _local = None
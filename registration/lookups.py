@@ -0,0 +1,35 @@
+from django.db.models import CharField, FloatField, Func, Lookup, Value
+
+
+@CharField.register_lookup
+class TrigramWordSimilar(Lookup):
+    """
+    Matches rows where the value is word similar to the given string (the
+    pg_trgm `%>` operator), i.e. where the string is similar to some run of
+    words in the value, so a short prefix such as "smi" matches "Smithson".
+    Like `trigram_similar`, it can use a gin_trgm_ops index. Django only ships
+    this lookup from 3.2.
+    """
+
+    lookup_name = "trigram_word_similar"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return "%s %%%%> %s" % (lhs, rhs), lhs_params + rhs_params
+
+
+class TrigramWordSimilarity(Func):
+    """
+    The pg_trgm word_similarity of `string` to `expression`, which
+    `trigram_word_similar` compares against its threshold. Django only ships
+    this function from 3.2.
+    """
+
+    function = "WORD_SIMILARITY"
+    output_field = FloatField()
+
+    def __init__(self, string, expression, **extra):
+        if not hasattr(string, "resolve_expression"):
+            string = Value(string)
+        super().__init__(string, expression, **extra)
@@ -1,6 +1,9 @@
 from django.core.management.base import BaseCommand
+from django.db import transaction
 import argparse
+import itertools
 import json
+import time
 import pandas as pd
 from registration.models import Family, Field, Student
 
@@ -21,10 +24,26 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument("csv", type=argparse.FileType("r"))
         parser.add_argument("fields_map", type=argparse.FileType("r"))
+        parser.add_argument(
+            "--bulk",
+            action="store_true",
+            help="Read the csv in chunks and insert each chunk with bulk_create",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of csv rows per chunk in bulk mode",
+        )
 
     def handle(self, *args, **options):
-        df = pd.read_csv(options["csv"])
-        records = df.to_dict(orient="records")
+        if options["bulk"]:
+            chunks = pd.read_csv(options["csv"], chunksize=options["chunk_size"])
+            df = next(chunks, None)
+            if df is None:
+                return
+        else:
+            df = pd.read_csv(options["csv"])
         default_fields_map = json.load(options["fields_map"])
 
         parent_default_fields = set()
@@ -56,6 +75,17 @@ class Command(BaseCommand):
             child_dynamic_fields_internal, Student.CHILD
         )
 
+        if options["bulk"]:
+            self.bulk_load(
+                itertools.chain([df], chunks),
+                default_fields_map,
+                parent_dynamic_fields,
+                parent_dynamic_field_ids,
+                child_dynamic_field_ids,
+            )
+            return
+
+        records = df.to_dict(orient="records")
         for record in records:
             parent, family = self.create_parent_family(record, default_fields_map)
             self.assign_dynamic_fields(
@@ -79,22 +109,74 @@ class Command(BaseCommand):
             field_ids[field] = field_obj.pk
         return field_ids
 
-    def create_parent_family(self, record, fields_map):
+    def bulk_load(
+        self,
+        chunks,
+        fields_map,
+        parent_dynamic_fields,
+        parent_dynamic_field_ids,
+        child_dynamic_field_ids,
+    ):
+        start = time.monotonic()
+        num_rows = 0
+        for chunk in chunks:
+            records = chunk.to_dict(orient="records")
+            with transaction.atomic():
+                families = Family.objects.bulk_create(
+                    Family(**self.get_family_args(record, fields_map))
+                    for record in records
+                )
+                parents = Student.objects.bulk_create(
+                    Student(
+                        **self.get_parent_args(record, fields_map),
+                        family=family,
+                        information=self.get_dynamic_fields(
+                            record, parent_dynamic_fields, parent_dynamic_field_ids
+                        ),
+                    )
+                    for record, family in zip(records, families)
+                )
+                for family, parent in zip(families, parents):
+                    family.parent = parent
+                Family.objects.bulk_update(families, ["parent"])
+                Student.objects.bulk_create(
+                    child
+                    for record, family in zip(records, families)
+                    for child in self.build_children(
+                        record, family, fields_map, child_dynamic_field_ids
+                    )
+                )
+
+            num_rows += len(records)
+            elapsed = time.monotonic() - start
+            self.stdout.write(
+                f"Loaded {num_rows} rows in {elapsed:.1f}s "
+                f"({num_rows / elapsed:.0f} rows/s)"
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"Successfully loaded {num_rows} rows"))
+
+    def get_parent_args(self, record, fields_map):
         parent_args = {
             k: record[fields_map[k]]
             for k in PARENT_DEFAULT_FIELDS
             if not pd.isnull(record[fields_map[k]])
         }
         parent_args["role"] = Student.PARENT
-        parent_obj = Student.objects.create(**parent_args)
-        parent_obj.save()
+        return parent_args
 
-        family_args = {
+    def get_family_args(self, record, fields_map):
+        return {
             k: record[fields_map[k]]
             for k in FAMILY_DEFAULT_FIELDS
             if not pd.isnull(record[fields_map[k]])
         }
-        family_obj = Family.objects.create(**family_args)
+
+    def create_parent_family(self, record, fields_map):
+        parent_obj = Student.objects.create(**self.get_parent_args(record, fields_map))
+        parent_obj.save()
+
+        family_obj = Family.objects.create(**self.get_family_args(record, fields_map))
         family_obj.parent = parent_obj
         family_obj.save()
 
@@ -103,33 +185,48 @@ class Command(BaseCommand):
 
         return parent_obj, family_obj
 
-    def create_children(self, record, family, fields_map, dynamic_field_ids_map):
+    def build_children(self, record, family, fields_map, dynamic_field_ids_map):
+        children = []
         for idx in range(len(fields_map["children"])):
             default_fields_map = fields_map["children"][idx]["default_fields"]
             dynamic_fields_map = fields_map["children"][idx]["dynamic_fields"]
             child_args = {
                 k: record[default_fields_map[k]]
                 for k in CHILD_DEFAULT_FIELDS
-                if not pd.isnull(record[fields_map[k]])
+                if not pd.isnull(record[default_fields_map[k]])
             }
             if all([pd.isnull(val) for val in child_args.values()]):
                 continue
-            child_obj = Student.objects.create(**child_args)
-            child_obj.family = family
-            child_obj.role = Student.CHILD
             dynamic_fields_dict = {
                 dynamic_field_ids_map[key]: record[value]
                 for key, value in dynamic_fields_map.items()
                 if not pd.isnull(record[value])
             }
-            child_obj.information = dynamic_fields_dict
+            children.append(
+                Student(
+                    **child_args,
+                    family=family,
+                    role=Student.CHILD,
+                    information=dynamic_fields_dict,
+                )
+            )
+        return children
+
+    def create_children(self, record, family, fields_map, dynamic_field_ids_map):
+        for child_obj in self.build_children(
+            record, family, fields_map, dynamic_field_ids_map
+        ):
             child_obj.save()
 
-    def assign_dynamic_fields(self, record, student, dynamic_fields, field_ids_map):
-        dynamic_fields_dict = {
+    def get_dynamic_fields(self, record, dynamic_fields, field_ids_map):
+        return {
             field_ids_map[field_name]: record[field_name]
             for field_name in dynamic_fields
             if not pd.isnull(record[field_name])
         }
-        student.information = dynamic_fields_dict
+
+    def assign_dynamic_fields(self, record, student, dynamic_fields, field_ids_map):
+        student.information = self.get_dynamic_fields(
+            record, dynamic_fields, field_ids_map
+        )
         student.save()
@@ -0,0 +1,136 @@
+from django.apps import apps
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import models
+from django.db.models import (
+    Count,
+    ExpressionWrapper,
+    FloatField,
+    OuterRef,
+    Prefetch,
+    Q,
+    Subquery,
+)
+from django.db.models.functions import Coalesce, Greatest
+
+from .lookups import TrigramWordSimilarity
+
+
+class FamilyQuerySet(models.QuerySet):
+    def with_list_details(self, expand=False, fields=None):
+        # num_children, the parent, the students and the non-guest enrolments
+        # in active sessions (as active_enrolments), for the requested fields
+        Enrolment = apps.get_model("enrolments", "Enrolment")
+        Student = apps.get_model("registration", "Student")
+        queryset = self
+        if fields is None or "num_children" in fields:
+            queryset = queryset.annotate(
+                num_children=Count(
+                    "students",
+                    filter=Q(
+                        students__role=Student.CHILD,
+                        students__deleted__isnull=True,
+                    ),
+                )
+            )
+        if fields is None or "parent" in fields:
+            queryset = queryset.select_related("parent")
+        if fields is None or {"children", "guests"} & fields:
+            queryset = queryset.prefetch_related("students")
+        if fields is None or "enrolment" in fields:
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    "enrolments",
+                    queryset=Enrolment.objects.filter(
+                        session__active=True, is_guest=False
+                    )
+                    .with_session_details(expand)
+                    .order_by("-session__start_date"),
+                    to_attr="active_enrolments",
+                )
+            )
+        return queryset
+
+    def with_search_details(self):
+        # what FamilySearchSerializer renders
+        Enrolment = apps.get_model("enrolments", "Enrolment")
+        return self.select_related("parent").prefetch_related(
+            "students",
+            Prefetch(
+                "enrolments",
+                queryset=Enrolment.objects.with_session_details(),
+            ),
+        )
+
+    def related_querysets(self):
+        # the families and the students, enrolments, sessions and classes they
+        # are rendered with, as conditional GET validators
+        Class = apps.get_model("enrolments", "Class")
+        Enrolment = apps.get_model("enrolments", "Enrolment")
+        Session = apps.get_model("enrolments", "Session")
+        Student = apps.get_model("registration", "Student")
+        family_ids = self.values("pk")
+        return [
+            self.model.objects.filter(pk__in=family_ids),
+            Student.all_objects.filter(
+                Q(family__in=family_ids)
+                | Q(
+                    pk__in=self.model.objects.filter(pk__in=family_ids).values("parent")
+                )
+            ),
+            Enrolment.objects.filter(family__in=family_ids),
+            Session.objects.filter(enrolments__family__in=family_ids),
+            Class.objects.filter(session__enrolments__family__in=family_ids),
+        ]
+
+    def search(self, query):
+        # trigram search over student names, email and phone numbers; names
+        # also match by word similarity, so that prefixes match
+        Student = apps.get_model("registration", "Student")
+        terms = query.split()
+
+        name_matches = Q()
+        for term in terms:
+            for field in ["first_name", "last_name"]:
+                name_matches |= Q(**{f"{field}__trigram_similar": term})
+                name_matches |= Q(**{f"{field}__trigram_word_similar": term})
+
+        # average over the search terms of each term's best name similarity
+        student_rank = ExpressionWrapper(
+            sum(
+                Greatest(
+                    TrigramSimilarity("first_name", term),
+                    TrigramSimilarity("last_name", term),
+                    TrigramWordSimilarity(term, "first_name"),
+                    TrigramWordSimilarity(term, "last_name"),
+                )
+                for term in terms
+            )
+            / len(terms),
+            output_field=FloatField(),
+        )
+        family_student_rank = (
+            Student.objects.filter(family=OuterRef("pk"))
+            .annotate(rank=student_rank)
+            .order_by("-rank")
+            .values("rank")[:1]
+        )
+
+        return (
+            self.filter(
+                Q(id__in=Student.objects.filter(name_matches).values("family_id"))
+                | Q(email__trigram_similar=query)
+                | Q(cell_number__trigram_similar=query)
+                | Q(home_number__trigram_similar=query)
+                | Q(work_number__trigram_similar=query)
+            )
+            .annotate(
+                rank=Greatest(
+                    Coalesce(Subquery(family_student_rank), 0.0),
+                    TrigramSimilarity("email", query),
+                    TrigramSimilarity("cell_number", query),
+                    TrigramSimilarity("home_number", query),
+                    TrigramSimilarity("work_number", query),
+                )
+            )
+            .order_by("-rank", "id")
+        )
@@ -0,0 +1,64 @@
+# Generated by Django 3.1.6 on 2026-10-18 14:51
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("registration", "0024_student_deleted"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="family",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["email"],
+                name="family_email_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="family",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["cell_number"],
+                name="family_cell_number_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="family",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["home_number"],
+                name="family_home_number_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="family",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["work_number"],
+                name="family_work_number_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="student",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["first_name"],
+                name="student_first_name_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="student",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["last_name"],
+                name="student_last_name_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
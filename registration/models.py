@@ -1,4 +1,6 @@
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
+from .managers import FamilyQuerySet
 from .validators import (
     validate_family_parent,
     validate_student,
@@ -48,16 +50,40 @@ class Family(models.Model):
         on_delete=models.SET_NULL,
     )
 
+    objects = FamilyQuerySet.as_manager()
+
     class Meta:
         verbose_name_plural = "families"
+        indexes = [
+            GinIndex(
+                fields=["email"],
+                name="family_email_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+            GinIndex(
+                fields=["cell_number"],
+                name="family_cell_number_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+            GinIndex(
+                fields=["home_number"],
+                name="family_home_number_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+            GinIndex(
+                fields=["work_number"],
+                name="family_work_number_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ]
 
     @property
     def children(self):
-        return self.students.filter(role=Student.CHILD)
+        return self._students_with_role(Student.CHILD)
 
     @property
     def guests(self):
-        return self.students.filter(role=Student.GUEST)
+        return self._students_with_role(Student.GUEST)
 
     @property
     def phone_number(self):
@@ -70,11 +96,42 @@ class Family(models.Model):
 
     @property
     def current_enrolment(self):
-        return (
-            self.enrolments.filter(session__active=True, is_guest=False)
-            .order_by("-session__start_date")
-            .first()
-        )
+        # use enrolments prefetched by Family.objects.with_list_details() if available
+        if hasattr(self, "active_enrolments"):
+            return next(iter(self.active_enrolments), None)
+        if "_current_enrolment" not in self.__dict__:
+            self._current_enrolment = (
+                self.enrolments.filter(session__active=True, is_guest=False)
+                .order_by("-session__start_date")
+                .first()
+            )
+        return self._current_enrolment
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.clear_cached_relations()
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self.clear_cached_relations()
+
+    def clear_cached_relations(self):
+        """
+        Forgets the memoized children, guests and current enrolment, so they
+        are fetched again on next access.
+        """
+        for attr in ["_students_by_role", "_current_enrolment", "active_enrolments"]:
+            self.__dict__.pop(attr, None)
+
+    def _students_with_role(self, role):
+        # use prefetched students (e.g. from prefetch_related("students")) if available
+        if "students" in getattr(self, "_prefetched_objects_cache", {}):
+            return [student for student in self.students.all() if student.role == role]
+        # otherwise keep one queryset per role, so its results are fetched once
+        students_by_role = self.__dict__.setdefault("_students_by_role", {})
+        if role not in students_by_role:
+            students_by_role[role] = self.students.filter(role=role)
+        return students_by_role[role]
 
     def __str__(self):
         if self.parent is not None:
@@ -112,11 +169,29 @@ class Student(SafeDeleteModel):
 
     class Meta:
         verbose_name_plural = "students"
+        indexes = [
+            GinIndex(
+                fields=["first_name"],
+                name="student_first_name_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+            GinIndex(
+                fields=["last_name"],
+                name="student_last_name_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ]
 
     def clean(self):
         validate_student(self)
         return super().clean()
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # soft deletes are saves too
+        if Student.family.is_cached(self) and self.family is not None:
+            self.family.clear_cached_relations()
+
 
 class Field(SafeDeleteModel):
     PARENT = "Parent"
@@ -1,4 +1,5 @@
 from django.db import models, transaction
+from django.utils import timezone
 from rest_framework import serializers
 from rest_framework.fields import SerializerMethodField
 
@@ -8,10 +9,15 @@ from .validators import (
     validate_field_order,
     validate_field_options,
 )
-from enrolments.serializers import EnrolmentSerializer
+from projectread.serializers import SparseFieldsetsMixin
+from enrolments.serializers import (
+    EnrolmentSerializer,
+    EnrolmentSummarySerializer,
+    get_enrolment_serializer_class,
+)
 
 
-class StudentSerializer(serializers.HyperlinkedModelSerializer):
+class StudentSerializer(SparseFieldsetsMixin, serializers.HyperlinkedModelSerializer):
     family = serializers.HyperlinkedRelatedField(
         view_name="family-detail", read_only=True
     )
@@ -36,7 +42,9 @@ class StudentSerializer(serializers.HyperlinkedModelSerializer):
         return super().validate(attrs)
 
 
-class StudentListSerializer(serializers.HyperlinkedModelSerializer):
+class StudentListSerializer(
+    SparseFieldsetsMixin, serializers.HyperlinkedModelSerializer
+):
     family = serializers.PrimaryKeyRelatedField(queryset=Family.objects.all())
 
     class Meta:
@@ -50,7 +58,7 @@ class StudentListSerializer(serializers.HyperlinkedModelSerializer):
         ]
 
 
-class FamilySerializer(serializers.HyperlinkedModelSerializer):
+class FamilySerializer(SparseFieldsetsMixin, serializers.HyperlinkedModelSerializer):
     parent = StudentSerializer()
     num_children = SerializerMethodField()
     children = StudentSerializer(many=True)
@@ -73,20 +81,28 @@ class FamilySerializer(serializers.HyperlinkedModelSerializer):
         ]
 
     def get_num_children(self, obj):
-        return obj.children.count()
+        # annotated by Family.objects.with_list_details()
+        if hasattr(obj, "num_children"):
+            return obj.num_children
+        return len(obj.children)
 
     def get_enrolment(self, obj):
         enrolment = self.context.get("enrolment")
         if enrolment is not None:
             return enrolment
 
-        if obj.current_enrolment is not None:
-            return EnrolmentSerializer(obj.current_enrolment).data
+        current_enrolment = obj.current_enrolment
+        if current_enrolment is not None:
+            return get_enrolment_serializer_class(self.context)(
+                current_enrolment, context=self.get_nested_context("enrolment")
+            ).data
 
         return None
 
 
-class FamilyDetailSerializer(serializers.HyperlinkedModelSerializer):
+class FamilyDetailSerializer(
+    SparseFieldsetsMixin, serializers.HyperlinkedModelSerializer
+):
     parent = StudentSerializer()
     children = StudentSerializer(many=True)
     guests = StudentSerializer(many=True)
@@ -112,8 +128,13 @@ class FamilyDetailSerializer(serializers.HyperlinkedModelSerializer):
         ]
 
     def get_enrolments(self, obj):
-        enrolments = obj.enrolments.order_by("session__created_at")
-        return EnrolmentSerializer(enrolments, many=True).data
+        enrolment_serializer_class = get_enrolment_serializer_class(self.context)
+        enrolments = obj.enrolments.with_session_details(
+            expand=enrolment_serializer_class is EnrolmentSerializer
+        ).order_by("session__created_at")
+        return enrolment_serializer_class(
+            enrolments, many=True, context=self.get_nested_context("enrolments")
+        ).data
 
     def create(self, validated_data):
         students = validated_data.pop("students")
@@ -131,45 +152,69 @@ class FamilyDetailSerializer(serializers.HyperlinkedModelSerializer):
     def update(self, instance, validated_data):
         validated_data.pop("enrolments")
         students_data = validated_data.pop("students")
-        students = (
-            [instance.parent]
-            + list(instance.children.all())
-            + list(instance.guests.all())
-        )
-
-        existing_students = Student.objects.filter(
-            id__in=[student.id for student in students]
-        )
+        student_ids = {
+            student_data.get("id")
+            for student_data in students_data
+            if student_data.get("id") is not None
+        }
 
-        students_to_delete = existing_students.difference(
-            Student.objects.filter(
-                id__in=[student.get("id") for student in students_data]
-            )
-        )
-        # TODO: change deletion of students to soft delete
-        for student in students_to_delete:
-            Student.objects.filter(id=student.id).delete()
-
-        for student_data in students_data:
-            student = Student.objects.filter(id=student_data.get("id"))
-            if student.exists():
-                student.update(
-                    first_name=student_data["first_name"],
-                    last_name=student_data["last_name"],
-                    date_of_birth=student_data["date_of_birth"],
-                    information=student_data["information"],
-                )
-            else:
-                Student.objects.create(
-                    first_name=student_data["first_name"],
-                    last_name=student_data["last_name"],
-                    role=student_data["role"],
-                    family=instance,
-                    date_of_birth=student_data["date_of_birth"],
-                    information=student_data["information"],
+        with transaction.atomic():
+            # fetch the family's parent, children & guests and any other
+            # submitted students in one query
+            students = {
+                student.id: student
+                for student in Student.objects.filter(
+                    models.Q(id=instance.parent_id)
+                    | models.Q(family=instance, role__in=[Student.CHILD, Student.GUEST])
+                    | models.Q(id__in=student_ids)
                 )
+            }
+
+            # soft delete removed students through safedelete, so its policy,
+            # signals and Student.save apply; an update rarely removes more
+            # than one or two
+            for student in students.values():
+                if student.id not in student_ids and (
+                    student.id == instance.parent_id or student.family_id == instance.id
+                ):
+                    student.delete()
+
+            students_to_update = []
+            students_to_create = []
+            for student_data in students_data:
+                student = students.get(student_data.get("id"))
+                if student is not None:
+                    student.first_name = student_data["first_name"]
+                    student.last_name = student_data["last_name"]
+                    student.date_of_birth = student_data["date_of_birth"]
+                    student.information = student_data["information"]
+                    student.updated_at = timezone.now()
+                    students_to_update.append(student)
+                else:
+                    students_to_create.append(
+                        Student(
+                            first_name=student_data["first_name"],
+                            last_name=student_data["last_name"],
+                            role=student_data["role"],
+                            family=instance,
+                            date_of_birth=student_data["date_of_birth"],
+                            information=student_data["information"],
+                        )
+                    )
+            Student.objects.bulk_update(
+                students_to_update,
+                [
+                    "first_name",
+                    "last_name",
+                    "date_of_birth",
+                    "information",
+                    "updated_at",
+                ],
+            )
+            Student.objects.bulk_create(students_to_create)
+
+            super().update(instance, validated_data)
 
-        super().update(instance, validated_data)
         instance.refresh_from_db()
         return instance
 
@@ -198,11 +243,13 @@ class FamilyDetailSerializer(serializers.HyperlinkedModelSerializer):
         return super().validate(attrs)
 
 
-class FamilySearchSerializer(serializers.HyperlinkedModelSerializer):
+class FamilySearchSerializer(
+    SparseFieldsetsMixin, serializers.HyperlinkedModelSerializer
+):
     parent = StudentListSerializer()
     children = StudentListSerializer(many=True)
     guests = StudentListSerializer(many=True)
-    enrolments = EnrolmentSerializer(many=True)
+    enrolments = EnrolmentSummarySerializer(many=True)
 
     class Meta:
         model = Family
@@ -220,18 +267,21 @@ class FamilySearchSerializer(serializers.HyperlinkedModelSerializer):
 class FieldListSerializer(serializers.ListSerializer):
     def to_representation(self, data):
         iterable = data.all() if isinstance(data, models.Manager) else data
-        fields = dict()
-
-        for role_choice in Field.ROLE_CHOICES:
-            role = role_choice[0]
-            fields[f"{role.lower()}_fields"] = super().to_representation(
-                iterable.filter(role=role).order_by("order")
+        if isinstance(iterable, models.QuerySet):
+            iterable = iterable.order_by("role", "order")
+        else:
+            iterable = sorted(iterable, key=lambda field: field.order)
+
+        fields = {f"{role.lower()}_fields": [] for role, _ in Field.ROLE_CHOICES}
+        for field in iterable:
+            fields[f"{field.role.lower()}_fields"].append(
+                self.child.to_representation(field)
             )
 
         return [fields]
 
 
-class FieldSerializer(serializers.HyperlinkedModelSerializer):
+class FieldSerializer(SparseFieldsetsMixin, serializers.HyperlinkedModelSerializer):
     class Meta:
         model = Field
         fields = [
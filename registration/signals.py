@@ -0,0 +1,15 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .field_cache import invalidate_field_definitions
+from .models import Field
+
+
+# soft deleting and undeleting a field both save it, so post_save covers them
+@receiver(post_save, sender=Field)
+@receiver(post_delete, sender=Field)
+def invalidate_field_cache(sender, **kwargs):
+    # once committed, so that no other process can reload the old rows and
+    # cache them under the new version
+    transaction.on_commit(invalidate_field_definitions)
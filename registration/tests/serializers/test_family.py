@@ -7,7 +7,7 @@ from registration.serializers import (
     FamilySerializer,
     StudentSerializer,
 )
-from enrolments.serializers import EnrolmentSerializer
+from enrolments.serializers import EnrolmentSerializer, EnrolmentSummarySerializer
 
 from datetime import date
 
@@ -96,7 +96,7 @@ class FamilySerializerTestCase(TestCase):
                     StudentSerializer(self.child2, context=context).data,
                 ],
                 "guests": [StudentSerializer(self.guest, context=context).data],
-                "enrolment": EnrolmentSerializer(
+                "enrolment": EnrolmentSummarySerializer(
                     self.current_enrolment, context=context
                 ).data,
             },
@@ -1,10 +1,12 @@
 from django.test.testcases import TestCase
+from safedelete.signals import post_softdelete
 
 from registration.models import Family, Field, Student
 from registration.serializers import FamilyDetailSerializer
+from enrolments.tests.utils.utils import ConstantQueriesMixin
 
 
-class FamilyDetailSerializerTestCase(TestCase):
+class FamilyDetailSerializerTestCase(ConstantQueriesMixin, TestCase):
     def setUp(self):
         self.parent_field = Field.objects.create(
             role=Field.PARENT,
@@ -161,7 +163,16 @@ class FamilyDetailSerializerTestCase(TestCase):
 
     def test_family_detail_serializer_update__delete_children(self):
         data = dict(self.family_data)
-        data["children"].pop(1)
+        removed_id = data["children"].pop(1)["id"]
+
+        # removed students are soft deleted through safedelete
+        deleted = []
+
+        def receiver(instance, **kwargs):
+            deleted.append(instance.id)
+
+        post_softdelete.connect(receiver, sender=Student)
+        self.addCleanup(post_softdelete.disconnect, receiver, sender=Student)
 
         serializer = FamilyDetailSerializer(instance=self.family, data=data)
         self.assertTrue(serializer.is_valid())
@@ -170,6 +181,55 @@ class FamilyDetailSerializerTestCase(TestCase):
 
         self.assertEqual(family.children.count(), 1)
         self.assertEqual(family.children.first(), self.child)
+        self.assertIsNotNone(Student.all_objects.get(id=removed_id).deleted)
+        self.assertEqual(deleted, [removed_id])
+
+    def test_family_detail_serializer_update__query_count(self):
+        serializers = []
+
+        def add_children(num_new_children):
+            data = dict(self.family_data)
+            data["children"] = [
+                {
+                    "id": child.id,
+                    "first_name": child.first_name,
+                    "last_name": child.last_name,
+                    "role": Student.CHILD,
+                    "date_of_birth": None,
+                    "information": {},
+                }
+                for child in self.family.children
+            ] + [
+                {
+                    "first_name": f"Child {i}",
+                    "last_name": "Weasley",
+                    "role": Student.CHILD,
+                    "date_of_birth": None,
+                    "information": {},
+                }
+                for i in range(num_new_children)
+            ]
+            serializer = FamilyDetailSerializer(instance=self.family, data=data)
+            self.assertTrue(serializer.is_valid())
+            serializers[:] = [serializer]
+
+        self.assertConstantQueries(
+            add_children, lambda: serializers[0].save(), small=1, large=4
+        )
+        self.assertEqual(self.family.children.count(), 7)
+
+    def test_family_detail_serializer_update__delete_guests(self):
+        data = dict(self.family_data)
+        data["guests"] = []
+
+        serializer = FamilyDetailSerializer(instance=self.family, data=data)
+        self.assertTrue(serializer.is_valid())
+        family = serializer.save()
+
+        self.assertEqual(family.guests.count(), 0)
+        self.assertEqual(
+            Student.all_objects.filter(id=self.guests_data[0]["id"]).count(), 1
+        )
 
     def test_family_detail_serializer_update__read_only(self):  # should fail
         data = dict(self.family_data)
@@ -63,6 +63,8 @@ class FieldSerializerTestCase(TestCase):
     def test_field_list_serializer(self):
         serializer = FieldListSerializer(child=FieldSerializer(), data=Field.objects)
         serializer.is_valid()
+        with self.assertNumQueries(1):
+            serializer.data
         self.assertEqual(
             serializer.data,
             [
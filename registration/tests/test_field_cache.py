@@ -0,0 +1,237 @@
+from contextlib import contextmanager
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from safedelete import HARD_DELETE
+
+from enrolments.validators import validate_fields
+from .. import field_cache
+from ..models import Field
+from ..validators import validate_student_information_role
+
+
+@contextmanager
+def run_on_commit():
+    """
+    Runs the on_commit callbacks registered inside the block when it exits,
+    as TestCase's transaction is never committed.
+    """
+    start = len(connection.run_on_commit)
+    yield
+    callbacks = connection.run_on_commit[start:]
+    del connection.run_on_commit[start:]
+    for _, callback in callbacks:
+        callback()
+
+
+class FieldCacheTestCase(TestCase):
+    def setUp(self):
+        self.cache = field_cache.get_cache()
+        self.cache.clear()
+        field_cache.clear()
+        self.addCleanup(self.cache.clear)
+        self.addCleanup(field_cache.clear)
+
+        self.parent_field = Field.objects.create(
+            role=Field.PARENT,
+            name="DOB",
+            question_type=Field.TEXT,
+            is_default=True,
+            order=2,
+        )
+        self.child_field = Field.objects.create(
+            role=Field.CHILD,
+            name="Allergies",
+            question_type=Field.SELECT,
+            is_default=True,
+            options=["Yes", "No"],
+            order=1,
+        )
+        self.parent_field_2 = Field.objects.create(
+            role=Field.PARENT,
+            name="Phone",
+            question_type=Field.TEXT,
+            is_default=True,
+            order=1,
+        )
+
+    @contextmanager
+    def assertFieldQueries(self, num):
+        # FIELD_CACHE is a database cache, so only count queries on the fields
+        with CaptureQueriesContext(connection) as queries:
+            yield
+        self.assertEqual(
+            len([query for query in queries if "registration_field" in query["sql"]]),
+            num,
+        )
+
+    def test_get_field_definitions(self):
+        definitions = field_cache.get_field_definitions()
+        self.assertEqual(
+            set(definitions.by_id),
+            {self.parent_field.id, self.child_field.id, self.parent_field_2.id},
+        )
+        self.assertEqual(definitions.by_id[self.child_field.id]["name"], "Allergies")
+        self.assertEqual(
+            [field["id"] for field in definitions.by_role[Field.PARENT]],
+            [self.parent_field_2.id, self.parent_field.id],
+        )
+
+    def test_get_field_definitions__cached(self):
+        field_cache.get_field_definitions()
+        with self.assertNumQueries(0):
+            validate_student_information_role(
+                {f"{self.parent_field.id}": "", f"{self.parent_field_2.id}": ""},
+                Field.PARENT,
+            )
+            self.assertRaises(
+                ValidationError,
+                validate_student_information_role,
+                {f"{self.child_field.id}": ""},
+                Field.PARENT,
+            )
+            validate_fields([self.parent_field.id, self.child_field.id])
+
+    def test_get_field_definitions__shared(self):
+        field_cache.get_field_definitions()
+        # another process only has the shared cache to load from
+        field_cache._local = None
+        with self.assertFieldQueries(0):
+            definitions = field_cache.get_field_definitions()
+        self.assertIn(self.child_field.id, definitions.by_id)
+
+        # and reloads once any process invalidates it, after checking the
+        # version at most every FIELD_CACHE_CHECK_INTERVAL seconds
+        self.cache.set(field_cache.VERSION_KEY, "new")
+        with self.assertNumQueries(0):
+            field_cache.get_field_definitions()
+        with override_settings(FIELD_CACHE_CHECK_INTERVAL=0):
+            with self.assertFieldQueries(1):
+                field_cache.get_field_definitions()
+            with self.assertFieldQueries(0):
+                field_cache.get_field_definitions()
+
+    def test_invalidate__save(self):
+        field_cache.get_field_definitions()
+        with run_on_commit():
+            self.child_field.role = Field.PARENT
+            self.child_field.save()
+            # the cache is only invalidated once the save is committed
+            self.assertRaises(
+                ValidationError,
+                validate_student_information_role,
+                {f"{self.child_field.id}": ""},
+                Field.PARENT,
+            )
+        validate_student_information_role({f"{self.child_field.id}": ""}, Field.PARENT)
+
+    def test_invalidate__soft_delete(self):
+        field_cache.get_field_definitions()
+        with run_on_commit():
+            self.child_field.delete()
+        self.assertNotIn(self.child_field.id, field_cache.get_field_definitions().by_id)
+        self.assertRaises(ValidationError, validate_fields, [self.child_field.id])
+
+        with run_on_commit():
+            self.child_field.undelete()
+        self.assertIn(self.child_field.id, field_cache.get_field_definitions().by_id)
+
+    def test_invalidate__hard_delete(self):
+        field_cache.get_field_definitions()
+        with run_on_commit():
+            self.child_field.delete(force_policy=HARD_DELETE)
+        self.assertNotIn(self.child_field.id, field_cache.get_field_definitions().by_id)
+
+    def test_get_field_roles__bulk_created(self):
+        field_cache.get_field_definitions()
+        # bulk_create sends no signals, so the missing id triggers a reload
+        [session_field] = Field.objects.bulk_create(
+            [
+                Field(
+                    role=Field.SESSION,
+                    name="Ontario Works",
+                    question_type=Field.TEXT,
+                    is_default=True,
+                    order=1,
+                )
+            ]
+        )
+        self.assertEqual(
+            field_cache.get_field_roles([session_field.id, 0]),
+            {session_field.id: Field.SESSION},
+        )
+        validate_fields([session_field.id])
+
+    def test_get_field_roles__missing(self):
+        with run_on_commit():
+            self.child_field.delete()
+        field_cache.get_field_roles([self.parent_field.id])
+
+        # deleted and unknown ids are only looked up once per version
+        with self.assertFieldQueries(1):
+            field_cache.get_field_roles([self.child_field.id, 0])
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                field_cache.get_field_roles(
+                    [self.parent_field.id, self.child_field.id]
+                ),
+                {self.parent_field.id: Field.PARENT},
+            )
+            self.assertEqual(field_cache.get_field_roles([0]), {})
+
+        with run_on_commit():
+            self.child_field.undelete()
+        self.assertEqual(
+            field_cache.get_field_roles([self.child_field.id]),
+            {self.child_field.id: Field.CHILD},
+        )
+
+    def test_check_cache_backend(self):
+        field_cache.check_cache_backend()
+        with override_settings(
+            CACHES={
+                "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+            },
+            FIELD_CACHE="default",
+        ):
+            with self.assertLogs("registration.field_cache", "WARNING") as logs:
+                field_cache.check_cache_backend()
+            self.assertIn("LocMemCache", logs.output[0])
+
+            # the definitions are still cached, just per process
+            field_cache.get_field_definitions()
+            with self.assertNumQueries(0):
+                validate_fields([self.parent_field.id, self.child_field.id])
+
+
+class FieldCacheIsolationTestCase(TestCase):
+    """
+    Each test's Fields are rolled back without invalidating the process's copy
+    of the definitions, so it is cleared before each test.
+    """
+
+    def setUp(self):
+        field_cache.clear()
+        self.addCleanup(field_cache.clear)
+
+    def test_parent_field(self):
+        field = Field.objects.create(
+            role=Field.PARENT,
+            name="DOB",
+            question_type=Field.TEXT,
+            is_default=True,
+            order=1,
+        )
+        self.assertEqual(set(field_cache.get_field_definitions().by_id), {field.id})
+
+    def test_child_field(self):
+        field = Field.objects.create(
+            role=Field.CHILD,
+            name="Allergies",
+            question_type=Field.TEXT,
+            is_default=True,
+            order=1,
+        )
+        self.assertEqual(set(field_cache.get_field_definitions().by_id), {field.id})
@@ -2,7 +2,8 @@ from django.core.exceptions import ValidationError
 from django.test import TestCase
 from unittest.mock import patch
 
-from ..models import Student
+from enrolments.models import Enrolment, Session
+from ..models import Family, Student
 
 
 class ValidatorsTestCase(TestCase):
@@ -27,3 +28,72 @@ class ValidatorsTestCase(TestCase):
         )
         self.assertRaises(ValidationError, parent.clean)
         mock_validate.assert_called_once_with(parent)
+
+
+class FamilyTestCase(TestCase):
+    def setUp(self):
+        self.family = Family.objects.create(email="fish@test.com")
+        self.child = Student.objects.create(
+            first_name="Nemo", last_name="Fish", role=Student.CHILD, family=self.family
+        )
+        self.guest = Student.objects.create(
+            first_name="Dory", last_name="Fish", role=Student.GUEST, family=self.family
+        )
+        self.session = Session.objects.create(name="Fall 2021")
+        self.enrolment = Enrolment.objects.create(
+            family=self.family, session=self.session
+        )
+
+    def test_students_memoized(self):
+        family = Family.objects.get(id=self.family.id)
+        with self.assertNumQueries(2):
+            for _ in range(3):
+                self.assertEqual(list(family.children), [self.child])
+                self.assertEqual(len(family.guests), 1)
+
+    def test_students_prefetched(self):
+        family = Family.objects.prefetch_related("students").get(id=self.family.id)
+        with self.assertNumQueries(0):
+            self.assertEqual(family.children, [self.child])
+            self.assertEqual(family.guests, [self.guest])
+
+    def test_students_invalidated_on_student_change(self):
+        family = Family.objects.get(id=self.family.id)
+        self.assertEqual(len(family.children), 1)
+
+        Student.objects.create(
+            first_name="Coral", last_name="Fish", role=Student.CHILD, family=family
+        )
+        self.assertEqual(len(family.children), 2)
+
+        family.children[0].delete()
+        self.assertEqual(len(family.children), 1)
+
+    def test_current_enrolment_memoized(self):
+        family = Family.objects.get(id=self.family.id)
+        with self.assertNumQueries(1):
+            self.assertEqual(family.current_enrolment, self.enrolment)
+            self.assertEqual(family.current_enrolment, self.enrolment)
+
+        self.session.active = False
+        self.session.save()
+        self.assertEqual(family.current_enrolment, self.enrolment)
+        family.refresh_from_db()
+        self.assertIsNone(family.current_enrolment)
+
+    def test_current_enrolment_invalidated_on_enrolment_change(self):
+        family = Family.objects.get(id=self.family.id)
+        self.assertEqual(family.current_enrolment, self.enrolment)
+
+        enrolment = family.current_enrolment
+        enrolment.is_guest = True
+        enrolment.save()
+        self.assertIsNone(family.current_enrolment)
+
+    def test_cache_cleared_on_save(self):
+        family = Family.objects.get(id=self.family.id)
+        self.assertEqual(len(family.children), 1)
+        Student.objects.filter(id=self.child.id).update(role=Student.GUEST)
+
+        family.save()
+        self.assertEqual(len(family.children), 0)
@@ -0,0 +1,169 @@
+import csv
+import io
+import json
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from registration.models import Family, Field, Student
+
+FIELDS_MAP = {
+    "first_name": "Parent First Name",
+    "last_name": "Parent Last Name",
+    "email": "Email",
+    "home_number": "Home Phone",
+    "cell_number": "Cell Phone",
+    "work_number": "Work Phone",
+    "address": "Address",
+    "children": [
+        {
+            "default_fields": {
+                "first_name": "Child 1 First Name",
+                "last_name": "Child 1 Last Name",
+            },
+            "dynamic_fields": {"Child Gender": "Child 1 Gender"},
+        },
+        {
+            "default_fields": {
+                "first_name": "Child 2 First Name",
+                "last_name": "Child 2 Last Name",
+            },
+            "dynamic_fields": {"Child Gender": "Child 2 Gender"},
+        },
+    ],
+}
+
+HEADER = [
+    "Parent First Name",
+    "Parent Last Name",
+    "Email",
+    "Home Phone",
+    "Cell Phone",
+    "Work Phone",
+    "Address",
+    "Internet Access",
+    "Child 1 First Name",
+    "Child 1 Last Name",
+    "Child 1 Gender",
+    "Child 2 First Name",
+    "Child 2 Last Name",
+    "Child 2 Gender",
+]
+
+
+def make_row(i, num_children=1):
+    children = [
+        [f"Child {i}-{c}", f"Family {i}", "Girl"] for c in range(num_children)
+    ] + [["", "", ""]] * (2 - num_children)
+    return [
+        f"Parent {i}",
+        f"Family {i}",
+        f"family{i}@example.com",
+        "",
+        f"519-555-{i:04}",
+        "",
+        f"{i} Test Ave",
+        "Yes",
+        *[value for child in children for value in child],
+    ]
+
+
+class LoadRegistrationTestCase(TestCase):
+    def write_files(self, rows):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        paths = [
+            os.path.join(directory.name, "registration.csv"),
+            os.path.join(directory.name, "fields.json"),
+        ]
+        with open(paths[0], "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(HEADER)
+            writer.writerows(rows)
+        with open(paths[1], "w") as f:
+            json.dump(FIELDS_MAP, f)
+        return paths
+
+    def load(self, rows, **options):
+        stdout = io.StringIO()
+        with CaptureQueriesContext(connection) as queries:
+            call_command(
+                "load-registration", *self.write_files(rows), stdout=stdout, **options
+            )
+        return len(queries), stdout.getvalue()
+
+    def get_loaded_families(self):
+        field_names = dict(Field.objects.values_list("id", "name"))
+
+        def describe(student):
+            return {
+                "first_name": student.first_name,
+                "last_name": student.last_name,
+                "role": student.role,
+                "information": {
+                    field_names[int(field_id)]: value
+                    for field_id, value in student.information.items()
+                },
+            }
+
+        return [
+            {
+                "email": family.email,
+                "cell_number": family.cell_number,
+                "address": family.address,
+                "parent": describe(family.parent),
+                "children": [
+                    describe(child) for child in family.children.order_by("id")
+                ],
+            }
+            for family in Family.objects.order_by("id")
+        ]
+
+    def test_load_registration__bulk(self):
+        rows = [make_row(1, num_children=2), make_row(2, num_children=0)]
+        rows += [make_row(i) for i in range(3, 6)]
+        # load the rows one record at a time, then again in bulk
+        self.load(rows)
+        expected = self.get_loaded_families()
+        Student.all_objects.all().delete()
+        Family.objects.all().delete()
+
+        _, stdout = self.load(rows, bulk=True, chunk_size=2)
+
+        self.assertEqual(self.get_loaded_families(), expected)
+        self.assertEqual(len(expected), 5)
+        self.assertEqual(
+            expected[0]["parent"],
+            {
+                "first_name": "Parent 1",
+                "last_name": "Family 1",
+                "role": Student.PARENT,
+                "information": {"Internet Access": "Yes"},
+            },
+        )
+        self.assertEqual(
+            [len(family["children"]) for family in expected], [2, 0, 1, 1, 1]
+        )
+        self.assertEqual(
+            expected[0]["children"][1]["information"], {"Child Gender": "Girl"}
+        )
+        # one progress line per chunk of 2 rows
+        self.assertIn("Loaded 2 rows", stdout)
+        self.assertIn("Loaded 5 rows", stdout)
+        self.assertIn("Successfully loaded 5 rows", stdout)
+
+    def test_load_registration__bulk_query_count(self):
+        num_queries, _ = self.load([make_row(i) for i in range(2)], bulk=True)
+        self.assertEqual(Family.objects.count(), 2)
+
+        # a single chunk takes the same number of queries however many rows
+        # it has
+        self.assertEqual(
+            self.load([make_row(i) for i in range(20)], bulk=True)[0], num_queries
+        )
+        self.assertEqual(Family.objects.count(), 22)
+        self.assertEqual(Student.objects.count(), 44)
@@ -21,9 +21,21 @@ def create_test_fields():
     return Field.objects.bulk_create([Field(**field) for field in fields_data])
 
 
-def gen_information(role):
+def get_role_fields():
+    """
+    Returns the field rows gen_information picks from, by role, so callers
+    generating many students can query them once.
+    """
+    role_fields = {role: [] for role, _ in Field.ROLE_CHOICES}
+    for field in Field.objects.values():
+        role_fields[field["role"]].append(field)
+    return role_fields
+
+
+def gen_information(role, role_fields=None):
     information = {}
-    role_fields = [field for field in Field.objects.filter(role=role).values()]
+    if role_fields is None:
+        role_fields = [field for field in Field.objects.filter(role=role).values()]
 
     if len(role_fields) == 0:
         return information
@@ -55,7 +67,7 @@ def gen_information(role):
     return information
 
 
-def create_test_family(last_name, staff_user=None):
+def build_test_family(last_name, staff_user=None):
     num_interactions = fake.pyint(min_value=0, max_value=3)
     family_interactions = []
     if staff_user is not None:
@@ -67,7 +79,7 @@ def create_test_family(last_name, staff_user=None):
             }
             family_interactions.append(interaction)
 
-    return Family.objects.create(
+    return Family(
         email=f"{last_name.lower()}@test.com",
         cell_number=fake.phone_number(),
         work_number=fake.phone_number(),
@@ -80,19 +92,34 @@ def create_test_family(last_name, staff_user=None):
     )
 
 
-def create_test_parent(
-    family,
-    last_name,
-):
-    role = Student.PARENT
-    parent = Student.objects.create(
+def create_test_family(last_name, staff_user=None):
+    family = build_test_family(last_name=last_name, staff_user=staff_user)
+    family.save()
+    return family
+
+
+def build_test_student(family, last_name, role, role_fields=None):
+    return Student(
         first_name=fake.first_name(),
         role=role,
-        information=gen_information(role),
+        date_of_birth=(
+            fake.date_this_decade().strftime("%Y-%m-%d")
+            if role == Student.CHILD
+            else None
+        ),
+        information=gen_information(role, role_fields),
         last_name=last_name,
         family=family,
     )
 
+
+def create_test_parent(
+    family,
+    last_name,
+):
+    parent = build_test_student(family, last_name, Student.PARENT)
+    parent.save()
+
     family.parent = parent
     family.save()
 
@@ -104,19 +131,10 @@ def create_test_children(
     last_name,
     num_children,
 ):
-    role = Student.CHILD
-    children = []
-    for _ in range(num_children):
-        children.append(
-            Student(
-                first_name=fake.first_name(),
-                role=role,
-                date_of_birth=fake.date_this_decade().strftime("%Y-%m-%d"),
-                information=gen_information(role),
-                last_name=last_name,
-                family=family,
-            )
-        )
+    children = [
+        build_test_student(family, last_name, Student.CHILD)
+        for _ in range(num_children)
+    ]
 
     return Student.objects.bulk_create(children)
 
@@ -126,18 +144,9 @@ def create_test_guests(
     last_name,
     num_guests,
 ):
-    role = Student.GUEST
-    guests = []
-    for _ in range(num_guests):
-        guests.append(
-            Student(
-                first_name=fake.first_name(),
-                role=role,
-                information=gen_information(role),
-                last_name=last_name,
-                family=family,
-            )
-        )
+    guests = [
+        build_test_student(family, last_name, Student.GUEST) for _ in range(num_guests)
+    ]
 
     return Student.objects.bulk_create(guests)
 
@@ -146,8 +155,10 @@ def create_test_family_with_students(
     num_children,
     num_guests,
     staff_user=None,
+    last_name=None,
 ):
-    last_name = fake.unique.last_name()
+    if last_name is None:
+        last_name = fake.unique.last_name()
     family = create_test_family(last_name=last_name, staff_user=staff_user)
     create_test_parent(
         family=family,
@@ -0,0 +1,123 @@
+import csv
+
+from django.http import StreamingHttpResponse
+from django.utils.encoding import force_str
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_csv.renderers import CSVRenderer
+
+from accounts.models import User
+from registration.models import Family, Field, Student
+
+
+def read_csv(response):
+    content = b"".join(response.streaming_content).decode()
+    return list(csv.DictReader(content.splitlines()))
+
+
+def render_values(queryset):
+    # the export as CSVRenderer rendered .values() before it was streamed
+    content = force_str(CSVRenderer().render(list(queryset.order_by("pk").values())))
+    return list(csv.DictReader(content.splitlines()))
+
+
+class ExportTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(email="user@staff.com")
+        self.family = Family.objects.create(
+            email="test@example.com",
+            cell_number="123456789",
+            address="1 Test Ave",
+        )
+        self.parent = Student.objects.create(
+            first_name="Marlin",
+            last_name="Fish",
+            role=Student.PARENT,
+            family=self.family,
+            information={"1": "yes"},
+        )
+        self.other_family = Family.objects.create(email="example@test.com")
+        self.field = Field.objects.create(
+            role=Field.CHILD,
+            name="Allergies",
+            question="Do they have any allergies?",
+            question_type=Field.SELECT,
+            is_default=True,
+            options=["Yes", "No"],
+            order=1,
+        )
+
+    def test_export_families(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get(reverse("export-families"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(response, StreamingHttpResponse)
+        rows = read_csv(response)
+        self.assertEqual(list(rows[0]), list(render_values(Family.objects)[0]))
+        self.assertEqual(
+            [row["id"] for row in rows],
+            [str(self.family.id), str(self.other_family.id)],
+        )
+        self.assertEqual(rows[0]["email"], self.family.email)
+        self.assertEqual(rows[0]["parent_id"], "")
+
+    def test_export_students(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get(reverse("export-students"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = read_csv(response)
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["family_id"], str(self.family.id))
+        self.assertEqual(rows[0]["information.1"], "yes")
+
+    def test_export_students__same_as_csv_renderer(self):
+        Student.objects.create(
+            first_name="Nemo",
+            last_name="Fish",
+            role=Student.CHILD,
+            family=self.family,
+            information={"2": ["Peanuts", "Shellfish"], "3": {"notes": None}},
+        )
+        Student.objects.create(
+            first_name="Dory",
+            role=Student.GUEST,
+            family=self.other_family,
+            information=None,
+        )
+        self.client.force_authenticate(self.user)
+        response = self.client.get(reverse("export-students"))
+
+        rows = read_csv(response)
+        self.assertEqual(rows, render_values(Student.objects))
+        self.assertEqual(
+            [column for column in rows[0] if column.startswith("information")],
+            [
+                "information",
+                "information.1",
+                "information.2.0",
+                "information.2.1",
+                "information.3.notes",
+            ],
+        )
+
+    def test_export_fields(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get(reverse("export-fields"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = read_csv(response)
+        self.assertEqual(len(rows), 1)
+        self.assertEqual([rows[0]["options.0"], rows[0]["options.1"]], ["Yes", "No"])
+
+    def test_export__accept_csv(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get(reverse("export-fields"), HTTP_ACCEPT="text/csv")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/csv")
+
+    def test_unauthorized(self):
+        response = self.client.get(reverse("export-families"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
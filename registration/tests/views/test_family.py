@@ -1,8 +1,18 @@
+from datetime import date
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
 from accounts.models import User
+from enrolments.models import Class, Enrolment, Session
+from enrolments.serializers import EnrolmentSerializer, EnrolmentSummarySerializer
+from enrolments.tests.utils.utils import (
+    ConstantQueriesMixin,
+    create_test_enrolled_families,
+)
 from registration.models import Family, Student
 from registration.serializers import (
     FamilySearchSerializer,
@@ -11,7 +21,7 @@ from registration.serializers import (
 )
 
 
-class FamilyTestCase(APITestCase):
+class FamilyTestCase(ConstantQueriesMixin, APITestCase):
     def setUp(self):
         self.user = User.objects.create(email="user@staff.com")
         self.family = Family.objects.create(
@@ -38,6 +48,93 @@ class FamilyTestCase(APITestCase):
         response = self.client.get(url)
         payload = response.json()
 
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            payload["results"],
+            [
+                FamilySerializer(self.family).data,
+                FamilySerializer(self.other_family).data,
+            ],
+        )
+        self.assertIsNone(payload["previous"])
+        self.assertIsNone(payload["next"])
+
+    def test_get_families__paginated(self):
+        url = reverse("family-list") + "?page_size=1"
+        self.client.force_authenticate(self.user)
+        response = self.client.get(url)
+        payload = response.json()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(payload["results"], [FamilySerializer(self.family).data])
+        self.assertIsNone(payload["previous"])
+
+        response = self.client.get(payload["next"])
+        payload = response.json()
+        self.assertEqual(payload["results"], [FamilySerializer(self.other_family).data])
+        self.assertIsNone(payload["next"])
+
+    def test_get_families__not_modified(self):
+        url = reverse("family-list") + "?page_size=1"
+        self.client.force_authenticate(self.user)
+        self.family.parent = self.parent
+        self.family.save()
+        etag = self.client.get(url)["ETag"]
+
+        # the validators only cover the families on the page, which is loaded
+        # once for the validators and the response
+        self.other_family.address = "3 Test Ave"
+        self.other_family.save()
+        with self.assertNumQueries(2):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.parent.first_name = "Nemo"
+        self.parent.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["results"][0]["parent"]["first_name"], "Nemo")
+
+    def test_get_families__not_modified__last_page(self):
+        url = reverse("family-list")
+        self.client.force_authenticate(self.user)
+        etag = self.client.get(url, {"page_size": 2})["ETag"]
+
+        # a new family adds a next link to what was the last page
+        Family.objects.create(email="new@test.com")
+        response = self.client.get(url, {"page_size": 2}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNotNone(response.json()["next"])
+
+        etag = self.client.get(url, {"paginate": "false"})["ETag"]
+        Family.objects.create(email="newer@test.com")
+        response = self.client.get(url, {"paginate": "false"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()), 4)
+
+    def test_get_family__not_modified(self):
+        url = reverse("family-detail", args=[self.family.id])
+        self.client.force_authenticate(self.user)
+        etag = self.client.get(url)["ETag"]
+
+        self.other_family.address = "3 Test Ave"
+        self.other_family.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.parent.delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(reverse("family-detail", args=["abc"]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get_families__unpaginated(self):
+        url = reverse("family-list") + "?paginate=false"
+        self.client.force_authenticate(self.user)
+        response = self.client.get(url)
+        payload = response.json()
+
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(
             payload,
@@ -54,6 +151,91 @@ class FamilyTestCase(APITestCase):
             ],
         )
 
+    def test_get_families__list_details(self):
+        url = reverse("family-list") + "?paginate=false"
+        self.client.force_authenticate(self.user)
+        Student.objects.create(
+            first_name="Nemo", last_name="Fish", role=Student.CHILD, family=self.family
+        )
+        Student.objects.create(
+            first_name="Coral", last_name="Fish", role=Student.CHILD, family=self.family
+        ).delete()
+        Student.objects.create(
+            first_name="Dory", last_name="Fish", role=Student.GUEST, family=self.family
+        )
+        inactive_session = Session.objects.create(
+            name="Winter 2021", start_date=date(2021, 12, 1), active=False
+        )
+        older_session = Session.objects.create(
+            name="Spring 2021", start_date=date(2021, 3, 1)
+        )
+        session = Session.objects.create(name="Fall 2021", start_date=date(2021, 9, 1))
+        Enrolment.objects.create(family=self.family, session=inactive_session)
+        Enrolment.objects.create(family=self.family, session=older_session)
+        enrolment = Enrolment.objects.create(family=self.family, session=session)
+        Enrolment.objects.create(
+            family=self.other_family, session=session, is_guest=True
+        )
+
+        response = self.client.get(url)
+        payload = response.json()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(payload[0]["num_children"], 1)
+        self.assertEqual(
+            payload[0]["enrolment"], EnrolmentSummarySerializer(enrolment).data
+        )
+        self.assertEqual(payload[1]["num_children"], 0)
+        self.assertIsNone(payload[1]["enrolment"])
+
+        response = self.client.get(url + "&expand=enrolments")
+        self.assertEqual(
+            response.json()[0]["enrolment"], EnrolmentSerializer(enrolment).data
+        )
+
+    def test_get_families__query_count(self):
+        url = reverse("family-list")
+        self.client.force_authenticate(self.user)
+        session = Session.objects.create(name="Spring 2021")
+        session_class = Class.objects.create(name="Fish class", session=session)
+
+        response = self.assertConstantQueries(
+            lambda num_families: create_test_enrolled_families(
+                num_families, session, session_class
+            ),
+            lambda: self.client.get(url),
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()["results"]), 13)
+
+    def test_get_families__sparse_fields(self):
+        url = reverse("family-list")
+        self.client.force_authenticate(self.user)
+        with CaptureQueriesContext(connection) as all_fields:
+            self.client.get(url)
+        with CaptureQueriesContext(connection) as sparse_fields:
+            response = self.client.get(url, {"fields": "id,email"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for family in response.json()["results"]:
+            self.assertEqual(set(family), {"id", "email"})
+        # students and enrolments are not loaded
+        self.assertEqual(len(sparse_fields), len(all_fields) - 2)
+
+    def test_get_family__sparse_fields(self):
+        self.family.parent = self.parent
+        self.family.save()
+        url = reverse("family-detail", args=[self.family.id])
+        self.client.force_authenticate(self.user)
+        response = self.client.get(url, {"fields": "id,parent.first_name,enrolments"})
+        payload = response.json()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(payload), {"id", "parent", "enrolments"})
+        self.assertEqual(
+            payload["parent"], {"first_name": self.family.parent.first_name}
+        )
+
     def test_get_family(self):
         url = reverse("family-detail", args=[self.family.id])
         self.client.force_authenticate(self.user)
@@ -143,7 +325,7 @@ class FamilyTestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
-class FamilySearchTestCase(APITestCase):
+class FamilySearchTestCase(ConstantQueriesMixin, APITestCase):
     def setUp(self):
         self.user = User.objects.create(email="user@staff.com")
         self.family = Family.objects.create(
@@ -247,6 +429,84 @@ class FamilySearchTestCase(APITestCase):
             ],
         )
 
+    def test_search_families_query(self):
+        url = reverse("family-list") + "search/"
+        self.client.force_authenticate(self.user)
+        response = self.client.get(url, {"query": "Marlin Fish"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json(),
+            [
+                FamilySearchSerializer(self.family).data,
+                FamilySearchSerializer(self.other_family).data,
+            ],
+        )
+
+    def test_search_families_query__typo(self):
+        url = reverse("family-list") + "search/"
+        self.client.force_authenticate(self.user)
+        response = self.client.get(url, {"query": "Marlen Cow"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [family["id"] for family in response.json()],
+            [self.other_family.id, self.family.id],
+        )
+
+    def test_search_families_query__prefix(self):
+        smithson = Family.objects.create(email="dory@test.com")
+        Student.objects.create(first_name="Dory", last_name="Smithson", family=smithson)
+        url = reverse("family-list") + "search/"
+        self.client.force_authenticate(self.user)
+        response = self.client.get(url, {"query": "smi"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([family["id"] for family in response.json()], [smithson.id])
+
+    def test_search_families_query__contact_info(self):
+        url = reverse("family-list") + "search/"
+        self.client.force_authenticate(self.user)
+        response = self.client.get(url, {"query": "98765432"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [family["id"] for family in response.json()], [self.other_family.id]
+        )
+
+        response = self.client.get(url, {"query": "example.com"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()), 2)
+
+    def test_search_families_query__limit(self):
+        url = reverse("family-list") + "search/"
+        self.client.force_authenticate(self.user)
+        response = self.client.get(url, {"query": "Marlin", "limit": 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()), 1)
+
+        response = self.client.get(url, {"query": "Marlin", "limit": "all"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_search_families_query__no_match(self):
+        url = reverse("family-list") + "search/"
+        self.client.force_authenticate(self.user)
+        response = self.client.get(url, {"query": "Zebra"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), [])
+
+    def test_search_families__query_count(self):
+        url = reverse("family-list") + "search/"
+        self.client.force_authenticate(self.user)
+        session = Session.objects.create(name="Spring 2021")
+        session_class = Class.objects.create(name="Fish class", session=session)
+
+        for params in [{"last_name": "Fish"}, {"query": "Fish"}]:
+            response = self.assertConstantQueries(
+                lambda num_families: create_test_enrolled_families(
+                    num_families, session, session_class, last_name="Fish"
+                ),
+                lambda: self.client.get(url, params),
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertGreater(len(response.json()), 10)
+
     def test_method_not_allowed(self):
         url = reverse("family-list") + "search/"
         self.client.force_authenticate(self.user)
@@ -47,6 +47,22 @@ class FieldTestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(payload, serializer.data)
 
+    def test_get_fields__etag(self):
+        url = reverse("field-list")
+        self.client.force_authenticate(self.user)
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+        self.guest_field.name = "Relationship"
+        self.guest_field.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
     def test_post_fields(self):
         url = reverse("field-list")
         self.client.force_authenticate(self.user)
@@ -2,6 +2,8 @@ from django.apps import apps
 from django.core.exceptions import ValidationError
 from django.db.models import Max
 
+from .field_cache import get_field_roles
+
 
 def validate_family_parent(student_id):
     Student = apps.get_model("registration", "Student")
@@ -24,12 +26,8 @@ def validate_student_information_role(information, role):
             valid_roles = [role, Field.SESSION]
         else:
             valid_roles = [role]
-        if (
-            Field.objects.filter(id__in=information.keys())
-            .exclude(role__in=valid_roles)
-            .count()
-            > 0
-        ):
+        field_roles = get_field_roles([int(key) for key in information.keys()])
+        if any(field_role not in valid_roles for field_role in field_roles.values()):
             raise ValidationError(
                 f"One of the provided IDs is not a valid {role} field ID"
             )
@@ -1,5 +1,6 @@
+from django.conf import settings
+from django.db.models import prefetch_related_objects
 from rest_framework import mixins, permissions, viewsets, status
-from rest_framework.views import APIView
 
 from .models import Family, Field, Student
 from .serializers import (
@@ -11,13 +12,20 @@ from .serializers import (
 )
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from rest_framework_csv import renderers as r
+
+from projectread.conditional import (
+    ConditionalListModelMixin,
+    ConditionalRetrieveModelMixin,
+)
+from projectread.exports import StreamingCSVExportView
+from projectread.pagination import CursorPagination
+from projectread.serializers import get_expanded, get_requested_fields
 
 
 class FamilyViewSet(
     viewsets.GenericViewSet,
-    mixins.ListModelMixin,
-    mixins.RetrieveModelMixin,
+    ConditionalListModelMixin,
+    ConditionalRetrieveModelMixin,
     mixins.CreateModelMixin,
     mixins.UpdateModelMixin,
 ):
@@ -28,6 +36,48 @@ class FamilyViewSet(
         "put",
     ]
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CursorPagination
+
+    def get_queryset(self):
+        if self.action == "list":
+            return Family.objects.with_list_details(
+                expand="enrolments" in get_expanded(self.request),
+                fields=get_requested_fields(self.request),
+            ).order_by("created_at", "id")
+        return super().get_queryset()
+
+    def get_conditional_querysets(self):
+        if self.action == "retrieve":
+            return self.filter_to_object(Family.objects.all()).related_querysets()
+
+        # only the families on the requested page, which list then renders;
+        # its prefetches are deferred until the response is known to be needed
+        self.conditional_page = self.paginate_queryset(
+            self.filter_queryset(self.get_queryset()).prefetch_related(None)
+        )
+        if self.conditional_page is None:
+            return Family.objects.all().related_querysets()
+        return Family.objects.filter(
+            pk__in=[family.pk for family in self.conditional_page]
+        ).related_querysets()
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(self.list_page, request, *args, **kwargs)
+
+    def list_page(self, request, *args, **kwargs):
+        # renders the page loaded by get_conditional_querysets
+        if self.conditional_page is None:
+            return mixins.ListModelMixin.list(self, request, *args, **kwargs)
+        prefetch_related_objects(
+            self.conditional_page, *self.get_queryset()._prefetch_related_lookups
+        )
+        serializer = self.get_serializer(self.conditional_page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    def get_conditional_state(self):
+        if self.action == "list" and self.conditional_page is not None:
+            return [self.paginator.get_next_link(), self.paginator.get_previous_link()]
+        return []
 
     def get_serializer_class(self):
         if self.action in ["retrieve", "create", "update"]:
@@ -45,6 +95,24 @@ class FamilyViewSet(
         parent_only = self.request.query_params.get("parent_only")
         first_name = self.request.query_params.get("first_name")
         last_name = self.request.query_params.get("last_name")
+        query = self.request.query_params.get("query", "").strip()
+        if query:
+            try:
+                limit = int(
+                    self.request.query_params.get("limit", settings.FAMILY_SEARCH_LIMIT)
+                )
+            except ValueError:
+                return Response(
+                    "limit must be an integer.", status=status.HTTP_400_BAD_REQUEST
+                )
+            limit = max(1, min(limit, settings.FAMILY_SEARCH_LIMIT))
+            return Response(
+                FamilySearchSerializer(
+                    Family.objects.search(query).with_search_details()[:limit],
+                    many=True,
+                ).data
+            )
+
         if not first_name and not last_name:
             return Response(
                 "No search parameters found.", status=status.HTTP_400_BAD_REQUEST
@@ -61,7 +129,11 @@ class FamilyViewSet(
             if last_name:
                 result = result.filter(students__last_name__iexact=last_name)
 
-        return Response(FamilySearchSerializer(result.distinct(), many=True).data)
+        return Response(
+            FamilySearchSerializer(
+                result.distinct().with_search_details(), many=True
+            ).data
+        )
 
 
 class StudentViewSet(viewsets.GenericViewSet, mixins.CreateModelMixin):
@@ -73,7 +145,7 @@ class StudentViewSet(viewsets.GenericViewSet, mixins.CreateModelMixin):
 
 class FieldViewSet(
     viewsets.GenericViewSet,
-    mixins.ListModelMixin,
+    ConditionalListModelMixin,
     mixins.CreateModelMixin,
     mixins.UpdateModelMixin,
     mixins.DestroyModelMixin,
@@ -82,27 +154,17 @@ class FieldViewSet(
     serializer_class = FieldSerializer
     http_method_names = ["get", "post", "put", "delete"]
     permission_classes = [permissions.IsAuthenticated]
+    # the field list is fetched on every form load but rarely changes
+    conditional_models = [Field]
 
 
-class ExportFamiliesView(APIView):
+class ExportFamiliesView(StreamingCSVExportView):
     queryset = Family.objects.all()
-    renderer_classes = [r.CSVRenderer]
-
-    def get(self, request, format=None):
-        return Response(list(Family.objects.values()))
 
 
-class ExportStudentsView(APIView):
+class ExportStudentsView(StreamingCSVExportView):
     queryset = Student.objects.all()
-    renderer_classes = [r.CSVRenderer]
 
-    def get(self, request, format=None):
-        return Response(list(Student.objects.values()))
 
-
-class ExportFieldsView(APIView):
+class ExportFieldsView(StreamingCSVExportView):
     queryset = Field.objects.all()
-    renderer_classes = [r.CSVRenderer]
-
-    def get(self, request, format=None):
-        return Response(list(Field.objects.values()))